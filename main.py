@@ -8,15 +8,22 @@ and uploads them to Garmin Connect with automatic duplicate detection.
 Usage:
     python main.py                  # Sync the latest activity
     python main.py --batch 10       # Sync last 10 activities
+    python main.py --batch 50 --workers 5  # Prepare 5 activities in parallel
 """
 
 import os
 import sys
+import queue
+import atexit
 import logging
+import logging.handlers
 import warnings
 import argparse
 from datetime import datetime
 from dotenv import load_dotenv
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Suppress urllib3 LibreSSL warning on macOS
 warnings.filterwarnings('ignore', message='urllib3 v2 only supports OpenSSL 1.1.1+')
@@ -24,7 +31,7 @@ warnings.filterwarnings('ignore', message='urllib3 v2 only supports OpenSSL 1.1.
 from services.mywhoosh_service import MyWhooshService
 from services.fit_file_service import FitFileService
 from services.garmin_service import GarminService
-from services.activity_processor import ActivityProcessor
+from services.activity_processor import ActivityProcessor, DEFAULT_MAX_WORKERS
 
 
 def setup_logging(log_level: str = 'INFO') -> None:
@@ -53,10 +60,45 @@ def setup_logging(log_level: str = 'INFO') -> None:
     console_handler.setFormatter(formatter)
     root_logger.addHandler(console_handler)
     
-    # File handler
+    # File handler, fed through a queue so disk writes happen on a
+    # background thread instead of blocking the sync workers
     file_handler = logging.FileHandler('mywhoosh_to_garmin.log')
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+def create_http_session(pool_maxsize: int = 20) -> requests.Session:
+    """Create the HTTP session shared by the services.
+
+    A single pooled session keeps connections (and TLS sessions) alive
+    across the login, activity list, download URL and S3 download calls.
+
+    Args:
+        pool_maxsize: Connections kept per host; should cover the worker count
+
+    Returns:
+        Configured requests.Session
+    """
+    # Only failed connection attempts are retried here; HTTP errors, timeouts
+    # and dropped transfers are left to ActivityProcessor._with_retry, which
+    # caps Retry-After waits, so the two layers never multiply
+    retry = Retry(
+        total=2,
+        connect=2,
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=0.5,
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    return session
 
 
 def load_config() -> dict:
@@ -76,6 +118,9 @@ def load_config() -> dict:
         'garmin_username': os.getenv('GARMIN_USERNAME'),
         'garmin_password': os.getenv('GARMIN_PASSWORD'),
         'log_level': os.getenv('LOG_LEVEL', 'INFO'),
+        'cache_dir': os.path.expanduser(
+            os.getenv('CACHE_DIR', '~/.cache/mywhoosh-to-garmin')
+        ),
     }
     
     # Validate required configuration
@@ -119,6 +164,13 @@ def main() -> int:
         action='store_true',
         help='Skip duplicate checking (faster but may upload duplicates)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        metavar='N',
+        help=f'Activities downloaded in parallel in batch mode (default: {DEFAULT_MAX_WORKERS})'
+    )
     args = parser.parse_args()
     
     try:
@@ -133,22 +185,29 @@ def main() -> int:
         logger.info("=" * 80)
         logger.info("MyWhoosh to Garmin Connect Activity Sync")
         logger.info("=" * 80)
-        logger.info(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info("Started at: %s", datetime.now().isoformat(' ', 'seconds'))
         logger.info("")
         
         # Initialize services
         logger.info("Initializing services...")
         
+        # Garmin uses its own pooled session managed by garth
+        # Each worker may hold a connection to MyWhoosh and one to S3
+        http_session = create_http_session(pool_maxsize=max(20, 2 * args.workers))
+        
         mywhoosh_service = MyWhooshService(
             config['mywhoosh_email'],
-            config['mywhoosh_password']
+            config['mywhoosh_password'],
+            session=http_session,
+            session_file=os.path.join(config['cache_dir'], 'mywhoosh_session.json')
         )
         
         fit_file_service = FitFileService()
         
         garmin_service = GarminService(
             config['garmin_username'],
-            config['garmin_password']
+            config['garmin_password'],
+            token_dir=os.path.join(config['cache_dir'], 'garmin_tokens')
         )
         
         logger.info("Services initialized")
@@ -158,7 +217,8 @@ def main() -> int:
         processor = ActivityProcessor(
             mywhoosh_service,
             fit_file_service,
-            garmin_service
+            garmin_service,
+            max_workers=args.workers
         )
         
         check_duplicates = not args.no_duplicates
@@ -177,7 +237,7 @@ def main() -> int:
         
         # Footer
         logger.info("")
-        logger.info(f"Finished at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info("Finished at: %s", datetime.now().isoformat(' ', 'seconds'))
         
         if success:
             logger.info("Exiting with success")
@@ -200,7 +260,7 @@ def main() -> int:
         if not logging.getLogger().hasHandlers():
             logging.basicConfig(level=logging.ERROR)
         
-        logging.exception(f"Unexpected error: {e}")
+        logging.exception("Unexpected error: %s", e)
         print(f"\n❌ Unexpected error: {e}\n", file=sys.stderr)
         return 1
 
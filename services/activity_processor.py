@@ -1,11 +1,56 @@
 """Activity processor for orchestrating the MyWhoosh to Garmin workflow."""
 
+from __future__ import annotations
+
+import time
+import functools
 import logging
-from typing import Optional
-from datetime import datetime
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import requests
+from urllib3.exceptions import ConnectTimeoutError
+from garminconnect import GarminConnectTooManyRequestsError
 from services.mywhoosh_service import MyWhooshService
 from services.fit_file_service import FitFileService
 from services.garmin_service import GarminService
+from services.utils import first_key
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso_datetime
+except ImportError:  # Optional speed-up; stdlib parsing is used otherwise
+    _parse_iso_datetime = None
+
+
+# Activity fields MyWhoosh has used for each piece of metadata, in preference order
+_ID_KEYS = ('id', '_id')
+_NAME_KEYS = ('name', 'title')
+_DATE_KEYS = ('date', 'startTime', 'createdAt', 'timestamp')
+
+# Separator line used around log banners
+_SEP = "=" * 70
+
+# Number of activities downloaded/modified ahead of the upload stage
+DEFAULT_MAX_WORKERS = 3
+
+# Date formats tried by _parse_activity_date after the ISO fast path
+_DATE_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S.%fZ',      # ISO with milliseconds and Z
+    '%Y-%m-%dT%H:%M:%SZ',          # ISO with Z
+    '%Y-%m-%dT%H:%M:%S',           # ISO without Z
+    '%Y-%m-%d %H:%M:%S',           # Space separated
+    '%Y-%m-%d',                     # Date only
+)
+
+# Retry policy for transient network failures while downloading/uploading
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF_BASE = 2.0
+RETRY_AFTER_MAX = 300
+TRANSIENT_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Concurrent Garmin duplicate checks; kept low because Garmin rate limits aggressively
+DUPLICATE_CHECK_WORKERS = 4
 
 
 class ActivityProcessor:
@@ -14,19 +59,100 @@ class ActivityProcessor:
     def __init__(self,
                  mywhoosh_service: MyWhooshService,
                  fit_file_service: FitFileService,
-                 garmin_service: GarminService):
+                 garmin_service: GarminService,
+                 max_workers: int = DEFAULT_MAX_WORKERS):
         """Initialize ActivityProcessor with injected services.
 
         Args:
             mywhoosh_service: Service for MyWhoosh operations
             fit_file_service: Service for FIT file operations
             garmin_service: Service for Garmin operations
+            max_workers: Activities prepared concurrently in batch mode
         """
         self.mywhoosh_service = mywhoosh_service
         self.fit_file_service = fit_file_service
         self.garmin_service = garmin_service
+        self.max_workers = max(1, max_workers)
         self.logger = logging.getLogger(__name__)
 
+    def _log_banner(self, title: str, level: int = logging.INFO) -> None:
+        """Log a title framed by separator lines.
+
+        Args:
+            title: Banner text
+            level: Logging level for all three lines
+        """
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, _SEP)
+            self.logger.log(level, title)
+            self.logger.log(level, _SEP)
+
+    @staticmethod
+    def _resolve_metadata_keys(sample: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Pick the id, name and date field names used by an activity.
+
+        Args:
+            sample: Representative activity dictionary
+
+        Returns:
+            Tuple of (id_key, name_key, date_key)
+        """
+        return (
+            next((key for key in _ID_KEYS if key in sample), _ID_KEYS[0]),
+            next((key for key in _NAME_KEYS if key in sample), _NAME_KEYS[0]),
+            next((key for key in _DATE_KEYS if sample.get(key)), _DATE_KEYS[0]),
+        )
+
+    @staticmethod
+    def _activity_metadata(activity: Dict[str, Any],
+                           keys: Tuple[str, str, str]) -> Tuple[Any, str, Any]:
+        """Extract (id, name, date) from an activity using pre-resolved keys.
+
+        Falls back to scanning every known field when the resolved key is
+        missing, so activities with a different shape are still handled.
+
+        Args:
+            activity: Activity dictionary
+            keys: Tuple from _resolve_metadata_keys()
+
+        Returns:
+            Tuple of (activity_id, activity_name, activity_date_str)
+        """
+        id_key, name_key, date_key = keys
+
+        activity_id = activity.get(id_key)
+        if activity_id is None:
+            activity_id = first_key(activity, _ID_KEYS, 'unknown')
+
+        activity_name = activity.get(name_key)
+        if activity_name is None:
+            activity_name = first_key(activity, _NAME_KEYS, 'Unknown Activity')
+
+        activity_date_str = activity.get(date_key)
+        if not activity_date_str:
+            activity_date_str = next((activity[key] for key in _DATE_KEYS if activity.get(key)), None)
+
+        return activity_id, activity_name, activity_date_str
+
+    def _authenticate_services(self, include_garmin: bool) -> None:
+        """Authenticate with MyWhoosh and, optionally, Garmin in parallel.
+
+        The two logins are independent, so running them concurrently makes
+        startup cost the slower of the two rather than their sum.
+
+        Args:
+            include_garmin: Whether to log in to Garmin as well
+        """
+        if not include_garmin or self.garmin_service.is_authenticated():
+            self.mywhoosh_service.authenticate()
+            return
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            mywhoosh_future = executor.submit(self.mywhoosh_service.authenticate)
+            garmin_future = executor.submit(self.garmin_service.authenticate)
+            mywhoosh_future.result()
+            garmin_future.result()
+
     def process_latest_activity(self, check_duplicates: bool = True) -> bool:
         """Process the latest activity from MyWhoosh to Garmin.
 
@@ -36,18 +162,13 @@ class ActivityProcessor:
         Returns:
             True if successful, False otherwise
         """
-        original_file_path: Optional[str] = None
-        modified_file_path: Optional[str] = None
-
         try:
             # Header
-            self.logger.info("=" * 70)
-            self.logger.info("MyWhoosh to Garmin Connect Activity Sync")
-            self.logger.info("=" * 70)
+            self._log_banner("MyWhoosh to Garmin Connect Activity Sync")
 
-            # Step 1: Authenticate with MyWhoosh
-            self.logger.info("Step 1: Authenticating with MyWhoosh...")
-            self.mywhoosh_service.authenticate()
+            # Step 1: Authenticate with MyWhoosh (and Garmin, for the duplicate check)
+            self.logger.info("Step 1: Authenticating with services...")
+            self._authenticate_services(include_garmin=check_duplicates)
 
             # Step 2: Get latest activity
             self.logger.info("Step 2: Fetching latest activity...")
@@ -58,26 +179,18 @@ class ActivityProcessor:
                 return False
 
             # Extract activity metadata for logging and duplicate checking
-            activity_id = latest_activity.get('id', latest_activity.get('_id', 'unknown'))
-            activity_name = latest_activity.get('name', latest_activity.get('title', 'Unknown Activity'))
-            activity_date_str = (
-                latest_activity.get('date') or 
-                latest_activity.get('startTime') or 
-                latest_activity.get('createdAt') or 
-                latest_activity.get('timestamp')
+            activity_id, activity_name, activity_date_str = self._activity_metadata(
+                latest_activity,
+                self._resolve_metadata_keys(latest_activity)
             )
 
-            self.logger.info(f"Activity: {activity_name}")
-            self.logger.info(f"Activity ID: {activity_id}")
-            self.logger.info(f"Activity date: {activity_date_str}")
+            self.logger.info("Activity: %s", activity_name)
+            self.logger.info("Activity ID: %s", activity_id)
+            self.logger.info("Activity date: %s", activity_date_str)
 
             # Step 3: Check for duplicates (if enabled)
             if check_duplicates:
                 self.logger.info("Step 3: Checking for duplicates on Garmin Connect...")
-                
-                # Authenticate with Garmin early for duplicate check
-                if not self.garmin_service.is_authenticated():
-                    self.garmin_service.authenticate()
 
                 # Parse activity date for duplicate checking
                 activity_date = self._parse_activity_date(activity_date_str)
@@ -90,27 +203,26 @@ class ActivityProcessor:
 
                     if is_duplicate:
                         self.logger.warning("⚠ Duplicate activity found - skipping upload")
-                        self.logger.info("=" * 70)
-                        self.logger.info("✓ Sync completed (duplicate skipped)")
-                        self.logger.info("=" * 70)
+                        self._log_banner("✓ Sync completed (duplicate skipped)")
                         return True  # Not an error - just skipped
                 else:
                     self.logger.warning(
-                        f"Could not parse activity date: {activity_date_str}. "
-                        f"Continuing with upload..."
+                        "Could not parse activity date: %s. Continuing with upload...",
+                        activity_date_str
                     )
             else:
                 self.logger.info("Step 3: Duplicate check disabled - skipping")
 
-            # Step 4: Download activity FIT file
+            # Step 4: Download activity FIT file (kept in memory, no temp files)
             self.logger.info("Step 4: Downloading activity FIT file...")
-            original_file_path = self.mywhoosh_service.download_activity(latest_activity)
-            self.logger.info(f"Downloaded to: {original_file_path}")
+            original_data = self._with_retry(
+                self.mywhoosh_service.download_activity_bytes, latest_activity
+            )
 
             # Step 5: Modify FIT file device info
             self.logger.info("Step 5: Modifying FIT file device info...")
-            modified_file_path = self.fit_file_service.modify_device_info(original_file_path)
-            self.logger.info(f"Modified file: {modified_file_path}")
+            modified_data = self.fit_file_service.modify_device_info_bytes(original_data)
+            self.logger.info("Modified FIT file (%s bytes)", len(modified_data))
 
             # Step 6: Authenticate with Garmin (if not already done)
             if not self.garmin_service.is_authenticated():
@@ -121,31 +233,108 @@ class ActivityProcessor:
 
             # Step 7: Upload to Garmin Connect
             self.logger.info("Step 7: Uploading to Garmin Connect...")
-            response = self.garmin_service.upload_activity(modified_file_path)
+            response = self._with_retry(
+                self.garmin_service.upload_activity_bytes,
+                modified_data,
+                self._upload_filename(activity_id)
+            )
+            self._invalidate_garmin_day(activity_date_str)
 
             # Success!
-            self.logger.info("=" * 70)
-            self.logger.info("✓ Sync completed successfully!")
-            self.logger.info("=" * 70)
-            self.logger.debug(f"Upload response: {response}")
+            self._log_banner("✓ Sync completed successfully!")
+            self.logger.debug("Upload response: %s", response)
 
             return True
 
         except Exception as e:
-            self.logger.error("=" * 70)
-            self.logger.error("✗ Sync failed!")
-            self.logger.error("=" * 70)
-            self.logger.exception(f"Error: {e}")
+            self._log_banner("✗ Sync failed!", logging.ERROR)
+            self.logger.exception("Error: %s", e)
             return False
 
-        finally:
-            # Cleanup temporary files
-            self.logger.info("Cleaning up temporary files...")
-            if original_file_path:
-                self.fit_file_service.cleanup_file(original_file_path)
-            if modified_file_path:
-                self.fit_file_service.cleanup_file(modified_file_path)
-            self.logger.info("Cleanup complete")
+    def _with_retry(self, fn: Callable[..., Any], *args: Any,
+                    attempts: int = RETRY_ATTEMPTS,
+                    backoff_base: float = RETRY_BACKOFF_BASE) -> Any:
+        """Call fn, retrying transient network failures with exponential backoff.
+
+        Waits ``backoff_base ** attempt`` seconds between attempts, or the
+        server's Retry-After on HTTP 429. Non-transient errors are raised
+        immediately.
+
+        Args:
+            fn: Callable to invoke
+            *args: Positional arguments for fn
+            attempts: Maximum number of attempts
+            backoff_base: Base of the exponential backoff, in seconds
+
+        Returns:
+            Whatever fn returns
+        """
+        for attempt in range(1, attempts + 1):
+            try:
+                return fn(*args)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, backoff_base)
+                if delay is None or attempt == attempts:
+                    raise
+                self.logger.warning(
+                    "Transient error (attempt %s/%s): %s - retrying in %.1fs",
+                    attempt, attempts, e, delay
+                )
+                time.sleep(delay)
+
+    @staticmethod
+    def _retry_delay(error: BaseException, attempt: int, backoff_base: float) -> Optional[float]:
+        """Return how long to wait before retrying error, or None if not transient.
+
+        Services wrap network errors in RuntimeError, so the exception
+        chain is walked to find the underlying requests/Garmin error.
+        Connection failures (including DNS errors) are not retried here,
+        since the HTTP adapters already retry those.
+        """
+        backoff = backoff_base ** attempt
+        seen = set()
+        current: Optional[BaseException] = error
+
+        while current is not None and id(current) not in seen:
+            seen.add(id(current))
+
+            if isinstance(current, GarminConnectTooManyRequestsError):
+                return backoff
+            if isinstance(current, (requests.ConnectionError, requests.Timeout)):
+                # Failed connection attempts were already retried by the
+                # session's HTTP adapter; only retry errors after connecting
+                reason = getattr(current.args[0], 'reason', None) if current.args else None
+                if isinstance(reason, ConnectTimeoutError):
+                    return None
+                return backoff
+
+            response = getattr(current, 'response', None)
+            status_code = getattr(response, 'status_code', None)
+            if status_code in TRANSIENT_STATUS_CODES:
+                retry_after = response.headers.get('Retry-After', '') if status_code == 429 else ''
+                if retry_after.isdigit():
+                    return float(min(int(retry_after), RETRY_AFTER_MAX))
+                return backoff
+
+            # garth keeps the original requests error on .error
+            current = current.__cause__ or getattr(current, 'error', None) or current.__context__
+
+        return None
+
+    def _invalidate_garmin_day(self, activity_date_str: Any) -> None:
+        """Make the next duplicate check for this activity's day refetch from Garmin.
+
+        Args:
+            activity_date_str: Raw activity date, as read from the activity
+        """
+        activity_date = self._parse_date_cached(activity_date_str) if activity_date_str else None
+        if activity_date:
+            self.garmin_service.invalidate_date_cache(activity_date)
+
+    @staticmethod
+    def _upload_filename(activity_id: Any) -> str:
+        """File name reported to Garmin for an in-memory upload."""
+        return f"mywhoosh_{activity_id}.fit"
 
     def _parse_activity_date(self, date_str: Optional[str]) -> Optional[datetime]:
         """Parse activity date from various possible formats.
@@ -159,31 +348,67 @@ class ActivityProcessor:
         if not date_str:
             return None
 
-        # Try parsing as Unix timestamp (numeric)
-        try:
-            timestamp = float(date_str)
-            # Timestamps are typically in seconds, but could be milliseconds
-            # If > 100 billion, likely milliseconds
-            if timestamp > 100_000_000_000:
-                timestamp = timestamp / 1000
-            return datetime.fromtimestamp(timestamp)
-        except (ValueError, AttributeError, OSError):
-            pass
+        parsed = self._parse_date_cached(date_str)
+        if parsed is None:
+            self.logger.warning("Could not parse date: %s", date_str)
+        return parsed
 
-        # Try different date formats
-        date_formats = [
-            '%Y-%m-%dT%H:%M:%S.%fZ',      # ISO with milliseconds and Z
-            '%Y-%m-%dT%H:%M:%SZ',          # ISO with Z
-            '%Y-%m-%dT%H:%M:%S',           # ISO without Z
-            '%Y-%m-%d %H:%M:%S',           # Space separated
-            '%Y-%m-%d',                     # Date only
-        ]
+    # Format that matched last; MyWhoosh emits one format, so try it first
+    _last_format: Optional[str] = None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _parse_date_cached(date_str: str) -> Optional[datetime]:
+        """Parse a date string, memoized since batches repeat the same values.
 
-        for fmt in date_formats:
+        Args:
+            date_str: Non-empty date string or numeric timestamp
+
+        Returns:
+            datetime object or None if parsing fails
+        """
+        # Unix timestamp (numeric); 12+ integer digits means milliseconds
+        if isinstance(date_str, (int, float)) or date_str.replace('.', '', 1).isdigit():
+            try:
+                timestamp = float(date_str)
+                if len(str(int(timestamp))) >= 12:
+                    timestamp = timestamp / 1000
+                return datetime.fromtimestamp(timestamp)
+            except (ValueError, OverflowError, OSError):
+                return None
+
+        if not isinstance(date_str, str):
+            return None
+
+        # C-accelerated ISO 8601 parser when installed
+        if _parse_iso_datetime is not None:
+            try:
+                parsed = _parse_iso_datetime(date_str)
+            except ValueError:
+                pass
+            else:
+                # UTC values are returned naive, like the strptime formats below
+                if parsed.utcoffset() == timedelta(0):
+                    parsed = parsed.replace(tzinfo=None)
+                return parsed
+
+        # Fast path: ISO 8601 with trailing Z (the usual MyWhoosh format)
+        if date_str.endswith('Z') and 'T' in date_str:
             try:
-                return datetime.strptime(date_str.replace('+00:00', ''), fmt)
+                return datetime.fromisoformat(date_str[:-1])
+            except ValueError:
+                pass
+
+        # Try different date formats, starting with the last one that matched
+        last_format = ActivityProcessor._last_format
+        formats = _DATE_FORMATS if last_format is None else (last_format,) + _DATE_FORMATS
+        for fmt in formats:
+            try:
+                parsed = datetime.strptime(date_str.replace('+00:00', ''), fmt)
             except (ValueError, AttributeError):
                 continue
+            ActivityProcessor._last_format = fmt
+            return parsed
 
         # Try isoformat parsing
         try:
@@ -192,7 +417,6 @@ class ActivityProcessor:
         except (ValueError, AttributeError):
             pass
 
-        self.logger.warning(f"Could not parse date: {date_str}")
         return None
 
     def process_multiple_activities(self, limit: int = 10, check_duplicates: bool = True) -> dict:
@@ -218,112 +442,216 @@ class ActivityProcessor:
 
         try:
             # Header
-            self.logger.info("=" * 70)
-            self.logger.info("MyWhoosh to Garmin Connect - Batch Activity Sync")
-            self.logger.info("=" * 70)
+            self._log_banner("MyWhoosh to Garmin Connect - Batch Activity Sync")
 
             # Step 1: Authenticate with services
             self.logger.info("Step 1: Authenticating with services...")
-            self.mywhoosh_service.authenticate()
-            if check_duplicates:
-                self.garmin_service.authenticate()
+            self._authenticate_services(include_garmin=check_duplicates)
 
             # Step 2: Get all activities
-            self.logger.info(f"Step 2: Fetching activities (limit: {limit})...")
+            self.logger.info("Step 2: Fetching activities (limit: %s)...", limit)
             activities = self.mywhoosh_service.get_activities(limit=limit)
 
             if not activities:
                 self.logger.info("No activities found - nothing to sync")
                 return stats
 
-            # Apply limit to activities list
-            activities = activities[:limit]
-            self.logger.info(f"Found {len(activities)} activities to process")
+            self.logger.info("Found %s activities to process", len(activities))
 
-            # Process each activity
+            # Resolve metadata up front so duplicate checks can run as one
+            # concurrent batch instead of a round-trip per loop iteration
+            # MyWhoosh uses the same field names for every activity in a
+            # response, so detect them once instead of probing each time
+            metadata_keys = self._resolve_metadata_keys(activities[0])
+            candidates = []
             for i, activity in enumerate(activities, 1):
                 try:
-                    self.logger.info(f"\n--- Processing activity {i}/{len(activities)} ---")
                     stats['total'] += 1
 
                     # Extract activity metadata
-                    activity_id = activity.get('id', activity.get('_id', 'unknown'))
-                    activity_name = activity.get('name', activity.get('title', 'Unknown Activity'))
-                    activity_date_str = (
-                        activity.get('date') or
-                        activity.get('startTime') or
-                        activity.get('createdAt') or
-                        activity.get('timestamp')
+                    activity_id, activity_name, activity_date_str = self._activity_metadata(
+                        activity, metadata_keys
                     )
 
-                    self.logger.info(f"Activity: {activity_name} (ID: {activity_id})")
+                    self.logger.info(
+                        "Activity %s/%s: %s (ID: %s)", i, len(activities), activity_name, activity_id
+                    )
 
-                    # Check for duplicates if enabled
+                    activity_date = None
                     if check_duplicates:
                         activity_date = self._parse_activity_date(activity_date_str)
-                        if activity_date:
-                            is_duplicate = self.garmin_service.check_duplicate_activity(
-                                activity_date,
-                                activity_name
-                            )
-                            if is_duplicate:
-                                self.logger.warning("⚠ Duplicate activity - skipping")
-                                stats['skipped'] += 1
-                                continue
-
-                    # Download and sync activity
-                    original_file_path = None
-                    modified_file_path = None
-
-                    try:
-                        # Download
-                        original_file_path = self.mywhoosh_service.download_activity(activity)
-                        self.logger.info("Downloaded FIT file")
-
-                        # Modify
-                        modified_file_path = self.fit_file_service.modify_device_info(original_file_path)
-                        self.logger.info("Modified FIT file")
-
-                        # Upload
-                        if not self.garmin_service.is_authenticated():
-                            self.garmin_service.authenticate()
-
-                        self.garmin_service.upload_activity(modified_file_path)
-                        self.logger.info("✓ Activity synced successfully")
-                        stats['synced'] += 1
-
-                    except Exception as e:
-                        self.logger.exception(f"✗ Failed to sync activity: {e}")
-                        stats['errors'] += 1
-
-                    finally:
-                        # Cleanup temp files
-                        if original_file_path:
-                            self.fit_file_service.cleanup_file(original_file_path)
-                        if modified_file_path:
-                            self.fit_file_service.cleanup_file(modified_file_path)
+                    candidates.append((activity, activity_name, activity_date))
 
                 except Exception as e:
-                    self.logger.exception(f"Error processing activity: {e}")
+                    self.logger.exception("Error processing activity: %s", e)
                     stats['errors'] += 1
                     continue
 
+            # Check for duplicates if enabled
+            if check_duplicates:
+                self.logger.info("Checking %s activities for duplicates...", len(candidates))
+                self._prefetch_garmin_activities(candidates)
+                duplicate_flags = self._check_duplicates(candidates)
+            else:
+                duplicate_flags = [False] * len(candidates)
+
+            pending = []
+            for (activity, activity_name, _), is_duplicate in zip(candidates, duplicate_flags):
+                if is_duplicate is None:
+                    stats['errors'] += 1
+                elif is_duplicate:
+                    self.logger.warning("⚠ Duplicate activity - skipping: %s", activity_name)
+                    stats['skipped'] += 1
+                else:
+                    pending.append(activity)
+
+            if pending:
+                self._sync_pipelined(pending, stats)
+
             # Summary
-            self.logger.info("\n" + "=" * 70)
-            self.logger.info("Batch Sync Summary")
-            self.logger.info("=" * 70)
-            self.logger.info(f"Total processed: {stats['total']}")
-            self.logger.info(f"Synced: {stats['synced']}")
-            self.logger.info(f"Skipped: {stats['skipped']}")
-            self.logger.info(f"Errors: {stats['errors']}")
-            self.logger.info("=" * 70)
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("")
+                self._log_banner("Batch Sync Summary")
+                self.logger.info("Total processed: %s", stats['total'])
+                self.logger.info("Synced: %s", stats['synced'])
+                self.logger.info("Skipped: %s", stats['skipped'])
+                self.logger.info("Errors: %s", stats['errors'])
+                self.logger.info(_SEP)
 
             return stats
 
         except Exception as e:
-            self.logger.error("=" * 70)
-            self.logger.error("✗ Batch sync failed!")
-            self.logger.error("=" * 70)
-            self.logger.exception(f"Error: {e}")
+            self._log_banner("✗ Batch sync failed!", logging.ERROR)
+            self.logger.exception("Error: %s", e)
             return stats
 
+    def _prefetch_garmin_activities(
+        self,
+        candidates: List[Tuple[Dict[str, Any], str, Optional[datetime]]]
+    ) -> None:
+        """Load Garmin activities covering the batch's dates in one search.
+
+        Failure, or a range too wide to prefetch, is not fatal: duplicate
+        checks then fetch per date.
+
+        Args:
+            candidates: Tuples of (activity, activity_name, activity_date)
+        """
+        dates = [activity_date for _, _, activity_date in candidates if activity_date]
+        if not dates:
+            return
+
+        try:
+            self.garmin_service.prefetch_activities(min(dates), max(dates))
+        except Exception as e:
+            self.logger.warning("Could not prefetch Garmin activities: %s", e)
+
+    def _check_duplicates(
+        self,
+        candidates: List[Tuple[Dict[str, Any], str, Optional[datetime]]]
+    ) -> List[Optional[bool]]:
+        """Run duplicate checks for a batch of activities concurrently.
+
+        Args:
+            candidates: Tuples of (activity, activity_name, activity_date)
+
+        Returns:
+            One flag per candidate, in order: True if duplicate, False if not
+            (or the date could not be parsed), None if the check itself failed
+        """
+        def check(candidate: Tuple[Dict[str, Any], str, Optional[datetime]]) -> Optional[bool]:
+            _, activity_name, activity_date = candidate
+            try:
+                return self.garmin_service.check_duplicate_activity(activity_date, activity_name)
+            except Exception as e:
+                self.logger.exception("Error checking duplicate for %s: %s", activity_name, e)
+                return None
+
+        flags: List[Optional[bool]] = [False] * len(candidates)
+
+        # Only activities on days that may hold a Garmin activity need a full check
+        to_check = [
+            index for index, (_, _, activity_date) in enumerate(candidates)
+            if activity_date and self.garmin_service.has_activities_on(activity_date)
+        ]
+        if not to_check:
+            return flags
+
+        with ThreadPoolExecutor(max_workers=DUPLICATE_CHECK_WORKERS) as executor:
+            results = executor.map(check, [candidates[index] for index in to_check])
+            for index, result in zip(to_check, results):
+                flags[index] = result
+
+        return flags
+
+    def _prepare_activity(self, activity: Dict[str, Any]) -> bytes:
+        """Download an activity and rewrite its device info in memory.
+
+        Runs on a worker thread so the next activities are prepared while
+        the current one is being uploaded.
+
+        Args:
+            activity: Activity dictionary from get_activities()
+
+        Returns:
+            Modified FIT file content
+        """
+        original_data = self._with_retry(self.mywhoosh_service.download_activity_bytes, activity)
+        return self.fit_file_service.modify_device_info_bytes(original_data)
+
+    def _sync_pipelined(self, activities: List[Dict[str, Any]], stats: dict) -> None:
+        """Download/modify activities in the background while uploading in order.
+
+        Uploads stay sequential on the calling thread (Garmin rate limits),
+        while up to ``max_workers`` activities are downloaded and modified
+        ahead of them, so network and FIT rewrite time overlap with uploads.
+
+        Args:
+            activities: Activities to sync (duplicates already filtered out)
+            stats: Batch statistics dictionary, updated in place
+        """
+        metadata_keys = self._resolve_metadata_keys(activities[0])
+        remaining = iter(activities)
+        in_flight: Deque[Tuple[Dict[str, Any], Future]] = deque()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            def submit_next() -> None:
+                activity = next(remaining, None)
+                if activity is not None:
+                    in_flight.append((activity, executor.submit(self._prepare_activity, activity)))
+
+            for _ in range(self.max_workers):
+                submit_next()
+
+            position = 0
+            while in_flight:
+                activity, future = in_flight.popleft()
+                position += 1
+                # Keep the look-ahead window full while this one uploads
+                submit_next()
+
+                activity_id, activity_name, activity_date_str = self._activity_metadata(
+                    activity, metadata_keys
+                )
+                self.logger.info("\n--- Processing activity %s/%s ---", position, len(activities))
+
+                try:
+                    modified_data = future.result()
+                    self.logger.info("Downloaded and modified FIT file for %s", activity_name)
+
+                    # Upload
+                    if not self.garmin_service.is_authenticated():
+                        self.garmin_service.authenticate()
+
+                    self._with_retry(
+                        self.garmin_service.upload_activity_bytes,
+                        modified_data,
+                        self._upload_filename(activity_id)
+                    )
+                    self._invalidate_garmin_day(activity_date_str)
+                    self.logger.info("✓ Activity synced successfully: %s", activity_name)
+                    stats['synced'] += 1
+
+                except Exception as e:
+                    self.logger.exception("✗ Failed to sync activity %s: %s", activity_name, e)
+                    stats['errors'] += 1
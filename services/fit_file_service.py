@@ -40,36 +40,11 @@ class FitFileService:
         if not os.path.exists(fit_file_path):
             raise FileNotFoundError(f"FIT file not found: {fit_file_path}")
 
-        # Set defaults for Garmin Edge 840
-        manufacturer = manufacturer or Manufacturer.GARMIN.value
-        product = product or 4024  # Edge 840 (not in GarminProduct enum yet)
-        software_version = software_version or 20.19
-
         self.logger.info(f"Modifying FIT file: {fit_file_path}")
-        self.logger.info(
-            f"Target device: Garmin Edge 840 "
-            f"(manufacturer: {manufacturer}, product: {product}, sw: {software_version})"
-        )
 
         try:
             content = FitFile.from_file(fit_file_path)
-
-            # Set auto_define to true, so that the builder creates the required Definition Messages
-            builder = FitFileBuilder(auto_define=True, min_string_size=50)
-
-            for record in content.records:
-                message = record.message
-                if isinstance(message, FileIdMessage):
-                    message.manufacturer = manufacturer
-                    message.product = product
-                elif isinstance(message, DeviceInfoMessage):
-                    message.manufacturer = manufacturer
-                    message.product = product
-                    message.software_version = software_version
-                builder.add(message)
-
-            # Build the FIT file object
-            fit_file = builder.build()
+            fit_file = self._rewrite_device_info(content, manufacturer, product, software_version)
 
             # Save the modified FIT file
             temp_dir = tempfile.gettempdir()
@@ -82,6 +57,76 @@ class FitFileService:
         except Exception as e:
             raise RuntimeError(f"Failed to modify FIT file: {e}") from e
 
+    def modify_device_info_bytes(self, data: bytes,
+                                 manufacturer: Optional[int] = None,
+                                 product: Optional[int] = None,
+                                 software_version: Optional[float] = None) -> bytes:
+        """Modifies the device manufacturer and type of an in-memory FIT file.
+
+        Args:
+            data: Original FIT file content
+            manufacturer: Device manufacturer (defaults to Garmin - ID 1)
+            product: Device product (defaults to Edge 840 - ID 4024)
+            software_version: Software version (defaults to 20.19)
+
+        Returns:
+            Modified FIT file content
+
+        Raises:
+            RuntimeError: If file modification fails
+        """
+        self.logger.info(f"Modifying FIT data ({len(data):,} bytes)")
+
+        try:
+            content = FitFile.from_bytes(data)
+            fit_file = self._rewrite_device_info(content, manufacturer, product, software_version)
+            return bytes(fit_file.to_bytes())
+
+        except Exception as e:
+            raise RuntimeError(f"Failed to modify FIT file: {e}") from e
+
+    def _rewrite_device_info(self, content: FitFile,
+                             manufacturer: Optional[int],
+                             product: Optional[int],
+                             software_version: Optional[float]) -> FitFile:
+        """Rebuild a parsed FIT file with Garmin device metadata.
+
+        Args:
+            content: Parsed original FIT file
+            manufacturer: Device manufacturer (defaults to Garmin - ID 1)
+            product: Device product (defaults to Edge 840 - ID 4024)
+            software_version: Software version (defaults to 20.19)
+
+        Returns:
+            Rebuilt FIT file object
+        """
+        # Set defaults for Garmin Edge 840
+        manufacturer = manufacturer or Manufacturer.GARMIN.value
+        product = product or 4024  # Edge 840 (not in GarminProduct enum yet)
+        software_version = software_version or 20.19
+
+        self.logger.info(
+            f"Target device: Garmin Edge 840 "
+            f"(manufacturer: {manufacturer}, product: {product}, sw: {software_version})"
+        )
+
+        # Set auto_define to true, so that the builder creates the required Definition Messages
+        builder = FitFileBuilder(auto_define=True, min_string_size=50)
+
+        for record in content.records:
+            message = record.message
+            if isinstance(message, FileIdMessage):
+                message.manufacturer = manufacturer
+                message.product = product
+            elif isinstance(message, DeviceInfoMessage):
+                message.manufacturer = manufacturer
+                message.product = product
+                message.software_version = software_version
+            builder.add(message)
+
+        # Build the FIT file object
+        return builder.build()
+
     def cleanup_file(self, file_path: str) -> None:
         """Clean up a temporary file.
 
@@ -1,8 +1,15 @@
 """Garmin service for handling authentication and activity uploads."""
 
+import io
+import os
+import time
+import bisect
+import random
 import logging
-from typing import Dict, Any, Optional, Union
-from datetime import datetime
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+from datetime import datetime, timedelta
 from garminconnect import (
     Garmin,
     GarminConnectAuthenticationError,
@@ -10,23 +17,140 @@ from garminconnect import (
     GarminConnectConnectionError
 )
 from garth.exc import GarthHTTPError
+from services.utils import first_key
+
+# Caps concurrent Garmin requests across all worker threads; Garmin's
+# rate limits are low and parallel duplicate checks would otherwise burst
+GARMIN_MAX_CONCURRENT_REQUESTS = 2
+_garmin_request_slots = threading.BoundedSemaphore(GARMIN_MAX_CONCURRENT_REQUESTS)
+
+# Seconds a day's Garmin activity list is reused before refetching, so
+# activities uploaded elsewhere in the meantime become visible
+ACTIVITY_CACHE_TTL = 300
+
+# Widest date range prefetched in one search. Garmin pages results, so a long
+# backfill would cost many requests; beyond this, duplicate checks look up
+# only the days that actually have MyWhoosh activities
+PREFETCH_MAX_DAYS = 21
+
+# Activities per page of Garmin's activity search (what garminconnect uses)
+ACTIVITY_PAGE_SIZE = 20
+
+# Garmin activity fields holding the start time, in order of preference
+_START_TIME_KEYS = ('startTimeLocal', 'startTime')
+
+# Sorted start timestamps alongside the (start, activity) pairs they index
+_StartIndex = Tuple[List[float], List[Tuple[datetime, Dict[str, Any]]]]
+
+# Login retries on 429: waits base * 2**attempt seconds (10s, 20s, ...)
+LOGIN_MAX_ATTEMPTS = 3
+LOGIN_BACKOFF_BASE = 10.0
+
+# Sustained request rate kept just below what Garmin tolerates
+GARMIN_REQUESTS_PER_SECOND = 4.0
+
+
+class _TokenBucket:
+    """Thread-safe token bucket that spaces out requests to a steady rate."""
+
+    def __init__(self, rate: float):
+        """Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second (also the burst capacity)
+
+        Raises:
+            ValueError: If rate is not positive
+        """
+        self._check_rate(rate)
+        self._lock = threading.Lock()
+        self._rate = rate
+        self._tokens = max(1.0, rate)
+        self._updated = time.monotonic()
+        self._acquired = 0
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _check_rate(rate: float) -> None:
+        """Reject rates that would stall or divide by zero in acquire()."""
+        if not rate > 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate (and burst capacity).
+
+        Raises:
+            ValueError: If rate is not positive
+        """
+        self._check_rate(rate)
+        with self._lock:
+            self._rate = rate
+            self._tokens = min(self._tokens, max(1.0, rate))
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                capacity = max(1.0, self._rate)
+                self._tokens = min(capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self._acquired += 1
+                    if self._acquired % 1000 == 0:
+                        self.logger.debug("Garmin rate limiter: %d requests so far", self._acquired)
+                    return
+
+                wait = (1 - self._tokens) / self._rate
+
+            time.sleep(wait)
+
+
+_garmin_rate_limiter = _TokenBucket(GARMIN_REQUESTS_PER_SECOND)
+
+
+@contextmanager
+def _garmin_request() -> Iterator[None]:
+    """Hold a concurrency slot and a rate-limit token for one Garmin call."""
+    with _garmin_request_slots:
+        _garmin_rate_limiter.acquire()
+        yield
 
 
 class GarminService:
     """Service for interacting with Garmin Connect."""
 
-    def __init__(self, username: str, password: str):
+    def __init__(self, username: str, password: str, token_dir: Optional[str] = None):
         """Initialize GarminService with credentials.
 
         Args:
             username: Garmin Connect username
             password: Garmin Connect password
+            token_dir: Optional directory where OAuth tokens are cached
+                between runs, so the SSO login only happens when they expire
         """
         self.username = username
         self.password = password
+        self.token_dir = os.path.expanduser(token_dir) if token_dir else None
         self.client: Garmin = Garmin(username, password)
         self.logger = logging.getLogger(__name__)
         self._authenticated = False
+        # (fetched_at, activities, start index) keyed by 'YYYY-MM-DD'; expires after ACTIVITY_CACHE_TTL
+        self._activities_by_date: Dict[str, Tuple[float, List[Dict[str, Any]], _StartIndex]] = {}
+
+    @staticmethod
+    def set_rate(requests_per_second: float) -> None:
+        """Change the rate limit shared by all GarminService instances.
+
+        Args:
+            requests_per_second: Sustained Garmin requests allowed per second
+
+        Raises:
+            ValueError: If requests_per_second is not positive
+        """
+        _garmin_rate_limiter.set_rate(requests_per_second)
 
     def authenticate(self) -> None:
         """Authenticate with Garmin Connect.
@@ -40,7 +164,9 @@ class GarminService:
         self.logger.info("Logging in to Garmin Connect...")
 
         try:
-            self.client.login()
+            if not self.load_tokens():
+                self._login_with_backoff()
+            self.save_tokens()
             self._authenticated = True
             self.logger.info("Successfully authenticated with Garmin Connect")
         except GarminConnectAuthenticationError:
@@ -53,9 +179,76 @@ class GarminService:
             self.logger.exception("Connection error. Check your internet connection.")
             raise
         except Exception as e:
-            self.logger.exception(f"Failed to login to Garmin Connect: {e}")
+            self.logger.exception("Failed to login to Garmin Connect: %s", e)
             raise RuntimeError(f"Authentication failed: {e}") from e
 
+    def load_tokens(self) -> bool:
+        """Resume a Garmin session from tokens cached in token_dir.
+
+        garminconnect loads the tokens and fetches the user profile and
+        settings with them, so a successful call means they still work.
+
+        Returns:
+            True if the cached tokens were loaded and accepted, False otherwise
+
+        Raises:
+            GarminConnectTooManyRequestsError: If Garmin is rate limiting
+        """
+        if not self.token_dir or not os.path.isdir(self.token_dir):
+            return False
+
+        try:
+            self.client.login(self.token_dir)
+        except GarminConnectTooManyRequestsError:
+            # A fresh SSO login would be rate limited too; let the caller back off
+            raise
+        except Exception as e:
+            self.logger.info("Cached Garmin tokens not usable, logging in again: %s", e)
+            return False
+
+        self.logger.info("Reusing cached Garmin session")
+        return True
+
+    def save_tokens(self) -> None:
+        """Write the current OAuth tokens to token_dir (mode 0700)."""
+        if not self.token_dir:
+            return
+
+        try:
+            os.makedirs(self.token_dir, mode=0o700, exist_ok=True)
+            self.client.garth.dump(self.token_dir)
+        except OSError as e:
+            self.logger.warning("Could not cache Garmin tokens: %s", e)
+
+    def _login_with_backoff(self, max_attempts: int = LOGIN_MAX_ATTEMPTS,
+                            base_delay: float = LOGIN_BACKOFF_BASE) -> None:
+        """Log in, backing off exponentially (with jitter) on rate limiting.
+
+        Only GarminConnectTooManyRequestsError is retried; credential and
+        connection errors propagate immediately.
+
+        Args:
+            max_attempts: Maximum number of login attempts
+            base_delay: Delay before the first retry, in seconds
+
+        Raises:
+            GarminConnectTooManyRequestsError: If still rate limited after max_attempts
+        """
+        for attempt in range(max_attempts):
+            try:
+                self.client.login()
+                return
+            except GarminConnectTooManyRequestsError:
+                if attempt == max_attempts - 1:
+                    raise
+                delay = base_delay * (2 ** attempt)
+                delay += random.uniform(0, delay * 0.1)
+                self.logger.warning(
+                    "Garmin login rate limited (attempt %d/%d), retrying in %.0fs...",
+                    attempt + 1, max_attempts, delay
+                )
+                time.sleep(delay)
+
     def upload_activity(self, fit_file_path: str) -> Any:
         """Upload a .fit file to Garmin Connect.
 
@@ -71,24 +264,69 @@ class GarminService:
         if not self._authenticated:
             raise RuntimeError("Must authenticate before uploading activities")
 
-        self.logger.info(f"Uploading {fit_file_path} to Garmin Connect...")
+        self.logger.info("Uploading %s to Garmin Connect...", fit_file_path)
 
         try:
-            response = self.client.upload_activity(fit_file_path)
-            self.logger.info("Upload successful")
-            self.logger.debug(f"Upload response: {response}")
-            return response
+            with _garmin_request():
+                response = self.client.upload_activity(fit_file_path)
         except Exception as e:
-            error_str = str(e)
-            
-            # Handle 409 Conflict gracefully (activity already exists)
-            if "409" in error_str or "Conflict" in error_str:
-                self.logger.info("⚠ Activity already exists on Garmin Connect (409 Conflict)")
-                self.logger.info("Treating as success - no duplicate upload needed")
-                return {"status": "skipped", "message": "Activity already exists on Garmin Connect"}
-            
-            self.logger.exception(f"Failed to upload activity: {e}")
-            raise RuntimeError(f"Upload failed: {e}") from e
+            return self._handle_upload_error(e)
+
+        return self._upload_succeeded(response)
+
+    def upload_activity_bytes(self, data: bytes, filename: str) -> Any:
+        """Upload in-memory FIT content to Garmin Connect.
+
+        Args:
+            data: FIT file content
+            filename: File name reported to Garmin (must end in .fit)
+
+        Returns:
+            Upload response from Garmin Connect or success dict if 409 Conflict (duplicate)
+
+        Raises:
+            RuntimeError: If not authenticated or upload fails (other than 409)
+        """
+        if not self._authenticated:
+            raise RuntimeError("Must authenticate before uploading activities")
+
+        self.logger.info("Uploading %s (%d bytes) to Garmin Connect...", filename, len(data))
+
+        try:
+            # Same request garminconnect's upload_activity() makes, minus the file read
+            files = {"file": (filename, io.BytesIO(data))}
+            with _garmin_request():
+                response = self.client.garth.post(
+                    "connectapi", self.client.garmin_connect_upload, files=files, api=True
+                )
+        except Exception as e:
+            return self._handle_upload_error(e)
+
+        return self._upload_succeeded(response)
+
+    def _upload_succeeded(self, response: Any) -> Any:
+        """Log a successful upload and return its response."""
+        self.logger.info("Upload successful")
+        self.logger.debug("Upload response: %s", response)
+        return response
+
+    def _handle_upload_error(self, e: Exception) -> Dict[str, str]:
+        """Treat 409 Conflict as success, re-raise anything else.
+
+        Raises:
+            RuntimeError: For any error other than 409 Conflict
+        """
+        error_str = str(e)
+        
+        # Handle 409 Conflict gracefully (activity already exists)
+        if "409" in error_str or "Conflict" in error_str:
+            self.logger.info("⚠ Activity already exists on Garmin Connect (409 Conflict)")
+            self.logger.info("Treating as success - no duplicate upload needed")
+            return {"status": "skipped", "message": "Activity already exists on Garmin Connect"}
+        
+        # May still be retried by the caller, which logs the final failure
+        self.logger.warning("Upload attempt failed: %s", e)
+        raise RuntimeError(f"Upload failed: {e}") from e
 
     def is_authenticated(self) -> bool:
         """Check if the service is authenticated.
@@ -98,6 +336,184 @@ class GarminService:
         """
         return self._authenticated
 
+    def prefetch_activities(self, start_date: datetime, end_date: datetime) -> int:
+        """Fetch Garmin activities for a date range once and cache them by day.
+
+        Subsequent check_duplicate_activity() calls for dates in the range
+        are answered from memory instead of one request per check. Ranges
+        longer than PREFETCH_MAX_DAYS are not prefetched; those checks fall
+        back to per-day lookups.
+
+        Args:
+            start_date: First day of the range
+            end_date: Last day of the range (inclusive)
+
+        Returns:
+            Number of Garmin activities fetched (0 if the range was skipped)
+
+        Raises:
+            RuntimeError: If not authenticated
+        """
+        if not self._authenticated:
+            raise RuntimeError("Must authenticate before fetching activities")
+
+        span_days = (end_date.date() - start_date.date()).days
+        if span_days > PREFETCH_MAX_DAYS:
+            self.logger.info(
+                "Not prefetching Garmin activities: %d-day range exceeds %d days",
+                span_days, PREFETCH_MAX_DAYS
+            )
+            return 0
+
+        start_str = start_date.strftime('%Y-%m-%d')
+        end_str = end_date.strftime('%Y-%m-%d')
+        self.logger.info("Prefetching Garmin activities from %s to %s...", start_str, end_str)
+
+        activities = self._search_activities(start_str, end_str)
+
+        # Seed every day so days without activities are cached as empty
+        by_date: Dict[str, List[Dict[str, Any]]] = {}
+        day = start_date.date()
+        while day <= end_date.date():
+            by_date[day.isoformat()] = []
+            day += timedelta(days=1)
+
+        for activity in activities:
+            start_time_str = first_key(activity, _START_TIME_KEYS)
+            if start_time_str:
+                by_date.setdefault(start_time_str[:10], []).append(activity)
+
+        fetched_at = time.monotonic()
+        for date_str, day_activities in by_date.items():
+            self._store_day(date_str, day_activities, fetched_at)
+        self.logger.info("Prefetched %d Garmin activities", len(activities))
+        return len(activities)
+
+    def _search_activities(self, start_str: str, end_str: str) -> List[Dict[str, Any]]:
+        """Page through Garmin's activity search for a date range.
+
+        Same request garminconnect's get_activities_by_date() makes, but each
+        page goes through the rate limiter rather than only the first.
+
+        Args:
+            start_str: First day in 'YYYY-MM-DD' format
+            end_str: Last day in 'YYYY-MM-DD' format (inclusive)
+
+        Returns:
+            List of Garmin activity dictionaries
+        """
+        activities: List[Dict[str, Any]] = []
+        start = 0
+        while True:
+            params = {
+                "startDate": start_str,
+                "endDate": end_str,
+                "start": str(start),
+                "limit": str(ACTIVITY_PAGE_SIZE),
+            }
+            with _garmin_request():
+                page = self.client.connectapi(self.client.garmin_connect_activities, params=params)
+            if not page:
+                break
+            activities.extend(page)
+            if len(page) < ACTIVITY_PAGE_SIZE:
+                # A short page is the last one; skip the empty-page round trip
+                break
+            start += ACTIVITY_PAGE_SIZE
+        return activities
+
+    def has_activities_on(self, activity_date: datetime) -> bool:
+        """Cheap pre-check before check_duplicate_activity().
+
+        Never gives a false negative: returns False only when prefetched
+        data shows no Garmin activity on that day, True otherwise
+        (including when the day was not prefetched).
+
+        Args:
+            activity_date: Date/time when the activity occurred
+
+        Returns:
+            False if the day is known to be empty on Garmin, True otherwise
+        """
+        activities = self._cached_activities(activity_date.strftime('%Y-%m-%d'))
+        return activities is None or len(activities) > 0
+
+    def invalidate_date_cache(self, activity_date: datetime) -> None:
+        """Drop cached Garmin activities for a day, e.g. after uploading to it.
+
+        Args:
+            activity_date: Any date/time on the day to invalidate
+        """
+        self._activities_by_date.pop(activity_date.strftime('%Y-%m-%d'), None)
+
+    def _store_day(self, date_str: str, activities: List[Dict[str, Any]],
+                   fetched_at: float) -> None:
+        """Cache a day's activities together with their parsed start times."""
+        self._activities_by_date[date_str] = (
+            fetched_at, activities, self._index_by_start(activities)
+        )
+
+    def _index_by_start(self, activities: List[Dict[str, Any]]) -> _StartIndex:
+        """Parse activity start times once and sort them for bisecting.
+
+        Args:
+            activities: Garmin activity dictionaries
+
+        Returns:
+            Sorted start timestamps and matching (start, activity) pairs
+        """
+        parsed = []
+        for activity in activities:
+            try:
+                start_time_str = first_key(activity, _START_TIME_KEYS)
+                if not start_time_str:
+                    continue
+
+                # Handle different time formats; only a trailing 'Z' needs rewriting
+                if start_time_str.endswith('Z'):
+                    start_time_str = start_time_str[:-1] + '+00:00'
+                activity_start = datetime.fromisoformat(start_time_str)
+                parsed.append((activity_start.timestamp(), activity_start, activity))
+
+            except (AttributeError, TypeError, ValueError) as e:
+                self.logger.warning("Error parsing activity: %s", e)
+                continue
+
+        parsed.sort(key=lambda item: item[0])
+        return [item[0] for item in parsed], [item[1:] for item in parsed]
+
+    def _cached_day(self, date_str: str) -> Optional[Tuple[List[Dict[str, Any]], _StartIndex]]:
+        """Return cached activities and start index for a day, or None if missing or expired."""
+        entry = self._activities_by_date.get(date_str)
+        if entry is None:
+            return None
+        fetched_at, activities, index = entry
+        if time.monotonic() - fetched_at > ACTIVITY_CACHE_TTL:
+            self._activities_by_date.pop(date_str, None)
+            return None
+        return activities, index
+
+    def _cached_activities(self, date_str: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached activities for a day, or None if missing or expired."""
+        day = self._cached_day(date_str)
+        return day[0] if day is not None else None
+
+    def _get_activities_for_date(self, date_str: str) -> Tuple[List[Dict[str, Any]], _StartIndex]:
+        """Return Garmin activities for a day, from cache when fresh.
+
+        Args:
+            date_str: Day in 'YYYY-MM-DD' format
+
+        Returns:
+            List of Garmin activity dictionaries and their start index
+        """
+        day = self._cached_day(date_str)
+        if day is None:
+            activities = self._search_activities(date_str, date_str)
+            self._store_day(date_str, activities, time.monotonic())
+            day = self._cached_day(date_str)
+        return day
+
     def check_duplicate_activity(
         self,
         activity_date: datetime,
@@ -124,63 +540,54 @@ class GarminService:
             raise RuntimeError("Must authenticate before checking activities")
 
         self.logger.info(
-            f"Checking for duplicate activity around {activity_date} "
-            f"(±{threshold_hours}h window)"
+            "Checking for duplicate activity around %s (±%sh window)",
+            activity_date, threshold_hours
         )
 
         try:
             # Get activities for the date
             date_str = activity_date.strftime('%Y-%m-%d')
-            activities = self.client.get_activities_by_date(date_str, date_str)
+            activities, (start_times, starts) = self._get_activities_for_date(date_str)
 
             if not activities:
                 self.logger.info("No activities found on this date")
                 return False
 
-            self.logger.info(f"Found {len(activities)} activities on {date_str}")
-
-            # Check each activity
-            for activity in activities:
-                try:
-                    # Parse activity start time
-                    start_time_str = activity.get('startTimeLocal', activity.get('startTime'))
-                    if not start_time_str:
-                        continue
-
-                    # Handle different time formats
-                    start_time_str = start_time_str.replace('Z', '+00:00')
-                    activity_start = datetime.fromisoformat(start_time_str)
-
-                    # Calculate time difference in hours
-                    time_diff = abs((activity_start - activity_date).total_seconds() / 3600)
-
-                    if time_diff <= threshold_hours:
-                        self.logger.info(
-                            f"Found potential duplicate: '{activity.get('activityName')}' "
-                            f"at {activity_start} (Δ{time_diff:.1f}h)"
-                        )
-
-                        # Additional name matching if provided
-                        if activity_name:
-                            garmin_name = activity.get('activityName', '').lower()
-                            if activity_name.lower() in garmin_name or garmin_name in activity_name.lower():
-                                self.logger.info("✓ Activity name matches - confirmed duplicate")
-                                return True
-                            else:
-                                self.logger.info("✗ Activity name doesn't match, checking next...")
-                                continue
-                        else:
-                            # No name provided, time match is sufficient
-                            return True
-
-                except Exception as e:
-                    self.logger.warning(f"Error parsing activity: {e}")
-                    continue
+            self.logger.info("Found %d activities on %s", len(activities), date_str)
+
+            # Hoisted out of the loop: compare POSIX timestamps and one lowered name
+            target_name = activity_name.lower() if activity_name else None
+            target_ts = activity_date.timestamp()
+            threshold_seconds = threshold_hours * 3600
+
+            # Start times are pre-parsed and sorted: bisect to the window
+            lo = bisect.bisect_left(start_times, target_ts - threshold_seconds)
+            hi = bisect.bisect_right(start_times, target_ts + threshold_seconds)
+
+            for start_ts, (activity_start, activity) in zip(start_times[lo:hi], starts[lo:hi]):
+                delta = start_ts - target_ts
+
+                self.logger.info(
+                    "Found potential duplicate: '%s' at %s (Δ%.1fh)",
+                    activity.get('activityName'), activity_start, abs(delta) / 3600
+                )
+
+                # No name provided, time match is sufficient
+                if target_name is None:
+                    return True
+
+                # Additional name matching (case-insensitive substring, either way)
+                garmin_name = (activity.get('activityName') or '').lower()
+                if target_name in garmin_name or garmin_name in target_name:
+                    self.logger.info("✓ Activity name matches - confirmed duplicate")
+                    return True
+
+                self.logger.info("✗ Activity name doesn't match, checking next...")
 
             self.logger.info("No duplicate found")
             return False
 
         except Exception as e:
-            self.logger.warning(f"Error checking for duplicates: {e}")
+            self.logger.warning("Error checking for duplicates: %s", e)
             # Don't block upload if duplicate check fails
             return False
@@ -1,83 +1,275 @@
 """MyWhoosh service for handling authentication and activity downloads."""
 
 import os
+import json
 import time
 import uuid
+import secrets
+import base64
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from services.utils import DOWNLOAD_CHUNK_SIZE, PART_SUFFIX, first_key, remove_partial
+
+__all__ = ['MyWhooshService']
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up; response.json() is used otherwise
+    orjson = None
+
+_LOGIN_URL = "https://services.mywhoosh.com/http-service/api/login"
+_ACTIVITIES_URL = "https://service14.mywhoosh.com/v2/rider/profile/activities"
+_DOWNLOAD_URL = "https://service14.mywhoosh.com/v2/rider/profile/download-activity-file"
+
+# Sent with every authenticated API call. User-Agent is included because an
+# injected session (e.g. main.create_http_session) carries requests' default.
+# Authorization stays per-request because the session also fetches S3 URLs.
+_API_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "User-Agent": "MyWhoosh-Python-Client/1.0",
+}
+
+# Assumed token lifetime when the access token's expiry can't be decoded
+DEFAULT_SESSION_TTL = 3600
+
+# Cached sessions are treated as expired this many seconds early
+SESSION_EXPIRY_MARGIN = 60
+
+# Words in a 400 body suggesting the payload shape (not the request) is wrong
+_SCHEMA_ERROR_HINTS = (b'sortdate', b'field', b'param', b'required', b'unknown', b'validation')
+
+# Bytes of an error response body kept for log messages
+ERROR_BODY_PREVIEW = 200
+
+# Concurrent downloads in download_activities; kept low to stay clear of rate limits
+DEFAULT_DOWNLOAD_WORKERS = 4
+
+
+def _decode_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _encode_json(payload: Any) -> bytes:
+    """Serialize a JSON request body once, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
 
 
 class MyWhooshService:
     """Service for interacting with MyWhoosh API."""
 
-    def __init__(self, email: str, password: str):
+    def __init__(self, email: str, password: str,
+                 session: Optional[requests.Session] = None,
+                 session_file: Optional[str] = None):
         """Initialize MyWhooshService with credentials.
 
         Args:
             email: MyWhoosh account email
             password: MyWhoosh account password
+            session: Optional shared HTTP session (connection pooling/keep-alive)
+            session_file: Optional path where login tokens are cached between runs
         """
         self.email = email
         self.password = password
+        # Only sessions created here are closed by close()
+        self._owns_session = session is None
+        self.session = session or self._create_session()
+        self.session_file = session_file
         self.access_token: Optional[str] = None
         self.refresh_token: Optional[str] = None
         self.whoosh_id: Optional[str] = None
         self.device_id: str = str(uuid.uuid4())
+        # Serializes re-logins when parallel downloads all hit a 401
+        self._auth_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
 
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Create a pooled session for when none is injected.
+
+        Returns:
+            requests.Session with keep-alive connection pooling
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['User-Agent'] = "MyWhoosh-Python-Client/1.0"
+        return session
+
+    def close(self) -> None:
+        """Close the HTTP session if this service created it."""
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self) -> 'MyWhooshService':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
     def authenticate(self) -> None:
         """Authenticate with MyWhoosh.
 
+        Reuses a still-valid session from session_file when configured,
+        skipping the login request entirely.
+
         Raises:
             RuntimeError: If authentication fails
         """
-        self.logger.info(f"Authenticating with MyWhoosh as {self.email}...")
+        if self.load_session():
+            return
+
+        self.logger.info("Authenticating with MyWhoosh as %s...", self.email)
 
         payload = {
             "Username": self.email,
             "Password": self.password,
             "Platform": "Android",
             "Action": 1001,
-            "CorrelationId": str(uuid.uuid4()),
+            "CorrelationId": secrets.token_hex(16),
             "DeviceId": self.device_id,
             "Authorization": ""
         }
 
         try:
-            response = requests.post(
-                "https://services.mywhoosh.com/http-service/api/login",
+            response = self.session.post(
+                _LOGIN_URL,
                 json=payload,
                 timeout=30
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = _decode_json(response)
 
             if data.get("Success"):
                 self.access_token = data.get("AccessToken")
                 self.whoosh_id = data.get("WhooshId")
                 self.refresh_token = data.get("RefreshToken")
                 
-                self.logger.info(f"Successfully authenticated with MyWhoosh")
-                self.logger.info(f"WhooshId: {self.whoosh_id}")
+                self.logger.info("Successfully authenticated with MyWhoosh")
+                self.logger.info("WhooshId: %s", self.whoosh_id)
                 if self.access_token:
-                    self.logger.debug(f"Access token: {self.access_token[:50]}...")
+                    self.logger.debug("Access token: %.50s...", self.access_token)
+                self.save_session()
 
             else:
                 message = data.get("Message", "Unknown error")
-                self.logger.error(f"Authentication failed: {message}")
+                self.logger.error("Authentication failed: %s", message)
                 raise RuntimeError(f"Authentication failed: {message}")
 
         except requests.RequestException as e:
-            self.logger.exception(f"Network error during authentication: {e}")
+            self.logger.exception("Network error during authentication: %s", e)
             raise RuntimeError(f"Network error during authentication: {e}") from e
         except Exception as e:
-            self.logger.exception(f"Failed to authenticate with MyWhoosh: {e}")
+            self.logger.exception("Failed to authenticate with MyWhoosh: %s", e)
             raise RuntimeError(f"Authentication failed: {e}") from e
 
+    def load_session(self) -> bool:
+        """Restore cached login tokens from session_file if still valid.
+
+        Returns:
+            True if a valid session was loaded, False otherwise
+        """
+        if not self.session_file or not os.path.exists(self.session_file):
+            return False
+
+        try:
+            with open(self.session_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+
+            if cached.get('email') != self.email:
+                return False
+            if cached['expires_at'] - SESSION_EXPIRY_MARGIN <= time.time():
+                self.logger.info("Cached MyWhoosh session expired")
+                return False
+
+            self.access_token = cached['access_token']
+            self.refresh_token = cached.get('refresh_token')
+            self.whoosh_id = cached['whoosh_id']
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning("Ignoring unreadable MyWhoosh session cache: %s", e)
+            return False
+
+        self.logger.info("Reusing cached MyWhoosh session")
+        return True
+
+    def save_session(self) -> None:
+        """Write the current login tokens to session_file (mode 0600)."""
+        if not self.session_file or not self.access_token:
+            return
+
+        cached = {
+            'email': self.email,
+            'access_token': self.access_token,
+            'refresh_token': self.refresh_token,
+            'whoosh_id': self.whoosh_id,
+            'expires_at': self._token_expiry(self.access_token),
+        }
+
+        try:
+            os.makedirs(os.path.dirname(self.session_file) or '.', exist_ok=True)
+            fd = os.open(self.session_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(cached, f)
+            os.chmod(self.session_file, 0o600)
+        except OSError as e:
+            self.logger.warning("Could not cache MyWhoosh session: %s", e)
+
+    def invalidate_session(self) -> None:
+        """Forget the current tokens and delete the cached session."""
+        self.access_token = None
+        self.refresh_token = None
+        if self.session_file:
+            try:
+                os.remove(self.session_file)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning("Could not remove MyWhoosh session cache: %s", e)
+
+    @staticmethod
+    def _token_expiry(token: str) -> float:
+        """Read the expiry (epoch seconds) from a JWT access token.
+
+        Falls back to DEFAULT_SESSION_TTL from now if the token is not a
+        decodable JWT or has no 'exp' claim.
+        """
+        try:
+            payload = token.split('.')[1]
+            payload += '=' * (-len(payload) % 4)
+            return float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+        except (IndexError, ValueError, KeyError, TypeError):
+            return time.time() + DEFAULT_SESSION_TTL
+
+    def _auth_headers(self, token: Optional[str]) -> Dict[str, str]:
+        """Build headers for an authenticated MyWhoosh API call."""
+        return {**_API_HEADERS, "Authorization": f"Bearer {token}"}
+
+    def _reauthenticate(self, rejected_token: Optional[str]) -> None:
+        """Log in again after a 401, once across all threads.
+
+        Args:
+            rejected_token: Access token the server just rejected; if another
+                thread has already replaced it, its new login is reused
+        """
+        with self._auth_lock:
+            if self.access_token and self.access_token != rejected_token:
+                return
+            self.invalidate_session()
+            self.authenticate()
+
     def get_activities(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Fetch activities from MyWhoosh.
 
@@ -95,35 +287,32 @@ class MyWhooshService:
 
         self.logger.info("Fetching activities from MyWhoosh...")
 
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "User-Agent": "MyWhoosh-Python-Client/1.0"
-        }
+        token = self.access_token
+        headers = self._auth_headers(token)
 
-        # Try different payload strategies
-        payloads_to_try = [
-            {"page": 1, "limit": limit, "sortDate": "DESC"},  # Required sortDate parameter
-            {"page": 1, "limit": limit, "sortDate": "ASC"},
-        ]
+        payload = {"page": 1, "limit": limit, "sortDate": "DESC"}  # Required sortDate parameter
+        fallback_payload = {"page": 1, "limit": limit, "sortDate": "ASC"}
 
         last_error = None
-        
-        for i, payload in enumerate(payloads_to_try, 1):
+        reauthenticated = False
+
+        # Serialized once per payload shape; a 401 retry reuses the same bytes
+        body = _encode_json(payload)
+
+        while payload is not None:
             try:
-                self.logger.debug(f"Trying payload strategy {i}/{len(payloads_to_try)}: {payload}")
+                self.logger.debug("Fetching activities with payload: %s", payload)
                 
-                response = requests.post(
-                    "https://service14.mywhoosh.com/v2/rider/profile/activities",
+                response = self.session.post(
+                    _ACTIVITIES_URL,
                     headers=headers,
-                    json=payload,
+                    data=body,
                     timeout=30
                 )
 
                 if response.status_code == 200:
-                    data = response.json()
-                    self.logger.debug(f"Response structure: {list(data.keys())}")
+                    data = _decode_json(response)
+                    self.logger.debug("Response structure: %s", list(data) if isinstance(data, dict) else type(data).__name__)
                     
                     # Extract activities from response - handle new API structure
                     if isinstance(data, list):
@@ -145,35 +334,58 @@ class MyWhooshService:
                     else:
                         activities = []
                     
-                    self.logger.info(f"Found {len(activities)} activities")
+                    # The server is asked for `limit` items; trim in case it ignores that
+                    activities = activities[:limit]
+                    self.logger.info("Found %d activities", len(activities))
                     return activities
 
-                elif response.status_code == 401:
+                elif response.status_code == 401 and not reauthenticated:
                     self.logger.warning("Token expired, re-authenticating...")
-                    self.authenticate()
+                    self._reauthenticate(token)
+                    reauthenticated = True
                     # Retry with new token
-                    headers["Authorization"] = f"Bearer {self.access_token}"
+                    token = self.access_token
+                    headers = self._auth_headers(token)
                     continue
 
+                # Raw bytes preview: skips charset detection of large HTML error pages
+                last_error = f"HTTP {response.status_code}: {response.content[:ERROR_BODY_PREVIEW]!r}"
+                self.logger.warning("Payload %s failed: %s", payload, last_error)
+
+                # Only a schema complaint is worth another payload shape
+                if response.status_code == 400 and self._is_schema_error(response):
+                    payload, fallback_payload = fallback_payload, None
+                    body = _encode_json(payload)
                 else:
-                    last_error = f"HTTP {response.status_code}: {response.text}"
-                    self.logger.warning(f"Payload {payload} failed: {last_error}")
-                    continue
+                    payload = None
 
             except requests.RequestException as e:
                 last_error = str(e)
-                self.logger.warning(f"Payload {payload} failed with network error: {e}")
-                continue
-            except Exception as e:
+                self.logger.warning("Payload %s failed with network error: %s", payload, e)
+                payload = None
+            except (ValueError, TypeError, AttributeError) as e:
+                # Malformed JSON (decode errors are ValueErrors) or an unexpected shape
                 last_error = str(e)
-                self.logger.warning(f"Payload {payload} failed: {e}")
-                continue
+                self.logger.warning("Payload %s failed: %s", payload, e)
+                payload = None
 
-        # If we get here, all strategies failed
         error_msg = f"Could not fetch activities. Last error: {last_error}"
         self.logger.error(error_msg)
         raise RuntimeError(error_msg)
 
+    @staticmethod
+    def _is_schema_error(response: requests.Response) -> bool:
+        """Whether a 400 response complains about request fields.
+
+        Args:
+            response: HTTP 400 response from the activities endpoint
+
+        Returns:
+            True if the error body mentions a missing/unknown field
+        """
+        body = response.content[:1024].lower()
+        return any(hint in body for hint in _SCHEMA_ERROR_HINTS)
+
     def get_latest_activity(self) -> Optional[Dict[str, Any]]:
         """Get the most recent activity.
 
@@ -192,31 +404,32 @@ class MyWhooshService:
         latest = activities[0]
         
         # Log activity details
-        activity_id = latest.get('id', latest.get('_id', 'unknown'))
-        activity_name = latest.get('name', latest.get('title', 'Unknown Activity'))
-        activity_date = latest.get('date', latest.get('startTime', latest.get('createdAt', 'unknown')))
+        activity_id = first_key(latest, ('id', '_id'), 'unknown')
+        activity_name = first_key(latest, ('name', 'title'), 'Unknown Activity')
+        activity_date = first_key(latest, ('date', 'startTime', 'createdAt'), 'unknown')
         
-        self.logger.info(f"Latest activity: {activity_name}")
-        self.logger.info(f"Activity ID: {activity_id}")
-        self.logger.info(f"Activity date: {activity_date}")
+        self.logger.info("Latest activity: %s", activity_name)
+        self.logger.info("Activity ID: %s", activity_id)
+        self.logger.info("Activity date: %s", activity_date)
         
         return latest
 
-    def download_activity(self, activity: Dict[str, Any]) -> str:
-        """Download activity FIT file.
+    def _get_download_url(self, activity: Dict[str, Any]) -> str:
+        """Request the presigned S3 URL for an activity's FIT file.
 
         Args:
             activity: Activity dictionary from get_activities()
 
         Returns:
-            Path to downloaded FIT file
+            Presigned download URL
 
         Raises:
-            RuntimeError: If download fails
+            RuntimeError: If not authenticated or the URL request fails
+            ValueError: If the activity has no activityFileId
         """
-        activity_id = activity.get('id', activity.get('_id', 'unknown'))
+        activity_id = first_key(activity, ('id', '_id'), 'unknown')
         activity_file_id = activity.get('activityFileId')
-        self.logger.info(f"Downloading activity {activity_id}...")
+        self.logger.info("Downloading activity %s...", activity_id)
 
         if not self.access_token or not self.whoosh_id:
             raise RuntimeError("Must authenticate before downloading activities")
@@ -225,26 +438,31 @@ class MyWhooshService:
             raise ValueError(f"Activity {activity_id} has no activityFileId")
         
         # Get presigned S3 URL from the download-activity-file API endpoint
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-        }
-        
         payload = {
             "key": self.whoosh_id,
             "fileId": activity_file_id
         }
         
+        body = _encode_json(payload)
+
         try:
-            response = requests.post(
-                "https://service14.mywhoosh.com/v2/rider/profile/download-activity-file",
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
+            for attempt in range(2):
+                token = self.access_token
+                response = self.session.post(
+                    _DOWNLOAD_URL,
+                    data=body,
+                    headers=self._auth_headers(token),
+                    timeout=30
+                )
+                # A cached session may have been revoked server-side; log in once more
+                if response.status_code == 401 and attempt == 0:
+                    self.logger.warning("Token rejected, re-authenticating...")
+                    self._reauthenticate(token)
+                    continue
+                break
             response.raise_for_status()
             
-            data = response.json()
+            data = _decode_json(response)
             
             if data.get('error'):
                 raise RuntimeError(f"API error: {data.get('message')}")
@@ -256,46 +474,185 @@ class MyWhooshService:
         except requests.RequestException as e:
             raise RuntimeError(f"Failed to get download URL: {e}") from e
 
-        # Download the FIT file from S3
+        return download_url
+
+    def _check_fit_header(self, header: bytes) -> None:
+        """Log whether the first bytes of a file look like a FIT header.
+
+        Args:
+            header: First 14 bytes of the file (FIT header size)
+        """
+        # Check for FIT magic bytes at offset 8-11
+        if len(header) >= 12:
+            if header[8:12] == b'.FIT':
+                self.logger.info("✓ Valid FIT file header detected")
+            else:
+                self.logger.warning(
+                    "File doesn't have expected FIT magic bytes. Header: %s",
+                    header[:12].hex()
+                )
+        else:
+            self.logger.warning("File too small: %d bytes", len(header))
+
+    @staticmethod
+    def _expected_download_size(response: requests.Response) -> int:
+        """Reject S3 error pages before their body is read.
+
+        The presigned URL only allows GET, so this inspects the headers of
+        the streamed GET response instead of issuing a separate HEAD.
+
+        Args:
+            response: Streamed response for the presigned download URL
+
+        Returns:
+            Announced body size in bytes, or 0 if unknown or encoded
+
+        Raises:
+            RuntimeError: If the response is an HTML/XML page instead of a file
+        """
+        content_type = response.headers.get('Content-Type', '')
+        if content_type.startswith(('text/html', 'application/xml', 'text/xml')):
+            raise RuntimeError(f"Expected a FIT file but got {content_type}")
+
+        # A compressed body's length says nothing about the bytes written to disk
+        if response.headers.get('Content-Encoding'):
+            return 0
         try:
-            response = requests.get(download_url, timeout=60)
-            response.raise_for_status()
+            return int(response.headers.get('Content-Length', 0))
+        except ValueError:
+            return 0
 
-            file_size = len(response.content)
-            self.logger.info(f"Downloaded {file_size:,} bytes")
+    def download_activity_bytes(self, activity: Dict[str, Any]) -> bytes:
+        """Download activity FIT file into memory.
 
-            # Save to temporary directory
-            timestamp = int(time.time())
-            temp_dir = tempfile.gettempdir()
-            file_path = os.path.join(temp_dir, f"mywhoosh_{activity_id}_{timestamp}.fit")
+        Args:
+            activity: Activity dictionary from get_activities()
 
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
+        Returns:
+            Raw FIT file content
 
-            self.logger.info(f"Saved to: {file_path}")
+        Raises:
+            RuntimeError: If download fails
+        """
+        download_url = self._get_download_url(activity)
+
+        try:
+            # stream=True defers the body so an error page is rejected from its
+            # headers alone; a valid FIT file is then read into memory in full
+            with self.session.get(download_url, timeout=60, stream=True) as response:
+                response.raise_for_status()
+                self._expected_download_size(response)
+                content = response.content
+        except requests.RequestException as e:
+            self.logger.exception("Failed to download activity: %s", e)
+            raise RuntimeError(f"Download failed: {e}") from e
 
+        self.logger.info("Downloaded %d bytes", len(content))
+        self._check_fit_header(content[:14])
+        return content
+
+    def download_activity(self, activity: Dict[str, Any]) -> str:
+        """Download activity FIT file.
+
+        Args:
+            activity: Activity dictionary from get_activities()
+
+        Returns:
+            Path to downloaded FIT file
+
+        Raises:
+            RuntimeError: If download fails
+        """
+        activity_id = first_key(activity, ('id', '_id'), 'unknown')
+        download_url = self._get_download_url(activity)
+
+        # Save to temporary directory; build the path before the request goes out
+        timestamp = int(time.time())
+        temp_dir = tempfile.gettempdir()
+        file_path = os.path.join(temp_dir, f"mywhoosh_{activity_id}_{timestamp}.fit")
+        part_path = file_path + PART_SUFFIX
+
+        # Download the FIT file from S3
+        try:
+            # Stream straight to disk so memory stays at one chunk per download
+            with self.session.get(download_url, timeout=60, stream=True) as response:
+                response.raise_for_status()
+                expected_size = self._expected_download_size(response)
+                header = b''
+                with open(part_path, 'wb') as f:
+                    if expected_size and hasattr(os, 'posix_fallocate'):
+                        try:
+                            os.posix_fallocate(f.fileno(), 0, expected_size)
+                        except OSError:
+                            pass  # Not supported by every filesystem; just a hint
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        # Keep the FIT header (14 bytes) so the file needn't be re-read
+                        if len(header) < 14:
+                            header += chunk[:14 - len(header)]
+                        f.write(chunk)
+                    # Drop any preallocated tail if the body was shorter than announced
+                    file_size = f.tell()
+                    f.truncate()
+            os.replace(part_path, file_path)
+
+            self.logger.info("Downloaded %d bytes", file_size)
+            self.logger.info("Saved to: %s", file_path)
 
             # Verify it's a valid FIT file
-            with open(file_path, 'rb') as f:
-                header = f.read(14)  # FIT header is 14 bytes
-                
-                # Check for FIT magic bytes at offset 8-11
-                if len(header) >= 12:
-                    if header[8:12] == b'.FIT':
-                        self.logger.info("✓ Valid FIT file header detected")
-                    else:
-                        self.logger.warning(
-                            f"File doesn't have expected FIT magic bytes. "
-                            f"Header: {header[:12].hex()}"
-                        )
-                else:
-                    self.logger.warning(f"File too small: {len(header)} bytes")
+            self._check_fit_header(header)
 
             return file_path
 
         except requests.RequestException as e:
-            self.logger.exception(f"Failed to download activity: {e}")
+            remove_partial(part_path, self.logger)
+            self.logger.exception("Failed to download activity: %s", e)
             raise RuntimeError(f"Download failed: {e}") from e
         except Exception as e:
-            self.logger.exception(f"Error during download: {e}")
+            remove_partial(part_path, self.logger)
+            self.logger.exception("Error during download: %s", e)
             raise RuntimeError(f"Download error: {e}") from e
+
+    def download_activities(self, activities: List[Dict[str, Any]],
+                            max_workers: int = DEFAULT_DOWNLOAD_WORKERS) -> List[str]:
+        """Download several activity FIT files concurrently.
+
+        For callers that need files on disk; ActivityProcessor streams
+        activities through download_activity_bytes() instead.
+
+        Args:
+            activities: Activity dictionaries from get_activities()
+            max_workers: Maximum number of downloads in flight
+
+        Returns:
+            Paths to the downloaded FIT files, in the same order as activities
+
+        Raises:
+            RuntimeError: If any download fails; files that did download
+                are removed before the first error is re-raised
+            ValueError: If an activity has no activityFileId
+        """
+        if not activities:
+            return []
+
+        workers = max(1, min(max_workers, len(activities)))
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix="mywhoosh-download") as executor:
+            futures = [executor.submit(self.download_activity, activity)
+                       for activity in activities]
+
+        # The executor has waited for every download; don't leak the files
+        # that did succeed when another one failed
+        paths: List[str] = []
+        error: Optional[BaseException] = None
+        for future in futures:
+            exc = future.exception()
+            if exc is None:
+                paths.append(future.result())
+            elif error is None:
+                error = exc
+
+        if error is not None:
+            for path in paths:
+                remove_partial(path, self.logger)
+            raise error
+        return paths
@@ -0,0 +1,48 @@
+"""Small helpers shared by the services."""
+
+import os
+import logging
+from typing import Any, Iterable, Mapping, Optional
+
+# Read size when streaming FIT downloads to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Downloads stream into a side file with this suffix and are renamed into
+# place once complete, so a partial download never sits under the final name
+PART_SUFFIX = '.part'
+
+
+def first_key(data: Mapping[str, Any], keys: Iterable[str], default: Optional[Any] = None) -> Any:
+    """Return the value of the first key present with a non-None value.
+
+    Unlike chained ``d.get(a, d.get(b))`` calls, the fallbacks are only
+    looked up when the earlier keys miss.
+
+    Args:
+        data: Dictionary to look in (e.g. an activity from an API)
+        keys: Candidate keys, in order of preference
+        default: Value returned when no key matches
+
+    Returns:
+        The first non-None value, or default
+    """
+    for key in keys:
+        value = data.get(key)
+        if value is not None:
+            return value
+    return default
+
+
+def remove_partial(path: str, logger: logging.Logger) -> None:
+    """Delete an unfinished (or abandoned) download, if one was left behind.
+
+    Args:
+        path: File to remove; a missing file is not an error
+        logger: Logger for removal failures, which are not raised
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning("Could not remove partial download %s: %s", path, e)
@@ -6,20 +6,24 @@ import requests
 import logging
 from typing import Optional, Dict, Any
 from zwift import Client as ZwiftClient
+from services.utils import DOWNLOAD_CHUNK_SIZE, PART_SUFFIX, remove_partial
 
 
 class ZwiftService:
     """Service for interacting with Zwift API."""
 
-    def __init__(self, username: str, password: str):
+    def __init__(self, username: str, password: str,
+                 session: Optional[requests.Session] = None):
         """Initialize ZwiftService with credentials.
 
         Args:
             username: Zwift username
             password: Zwift password
+            session: Optional shared HTTP session (connection pooling/keep-alive)
         """
         self.username = username
         self.password = password
+        self.session = session or requests.Session()
         self.client: Optional[ZwiftClient] = None
         self.logger = logging.getLogger(__name__)
 
@@ -55,18 +59,22 @@ class ZwiftService:
         link = f"https://{last_activity['fitFileBucket']}.s3.amazonaws.com/{last_activity['fitFileKey']}"
         self.logger.info(f"Download link: {link}")
 
-        try:
-            response = requests.get(link, timeout=10)
-            response.raise_for_status()
-        except requests.RequestException as e:
-            raise RuntimeError(f"Failed to download activity: {e}") from e
-
         # Save the .fit file to a temporary location
         temp_dir = tempfile.gettempdir()
         fit_file_path = os.path.join(temp_dir, f"zwift_activity_{activity_id}.fit")
 
-        with open(fit_file_path, "wb") as file:
-            file.write(response.content)
+        part_path = fit_file_path + PART_SUFFIX
+        try:
+            with self.session.get(link, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                with open(part_path, "wb") as file:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        file.write(chunk)
+            os.replace(part_path, fit_file_path)
+        except (requests.RequestException, OSError) as e:
+            remove_partial(part_path, self.logger)
+            raise RuntimeError(f"Failed to download activity: {e}") from e
 
-        self.logger.info(f"Activity {activity_id} downloaded to {fit_file_path}")
+        file_size = os.path.getsize(fit_file_path)
+        self.logger.info(f"Activity {activity_id} downloaded to {fit_file_path} ({file_size:,} bytes)")
         return fit_file_path
@@ -1,7 +1,73 @@
 """Pytest configuration and fixtures."""
 
 import sys
-from unittest.mock import MagicMock
+import types
+from unittest.mock import MagicMock, Mock
 
-# Mock the zwift module before any imports
-sys.modules['zwift'] = MagicMock()
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+# Stub the zwift module before any imports. A plain module with just the
+# names services.zwift_service imports, so a new import fails loudly
+_zwift_stub = types.ModuleType('zwift')
+_zwift_stub.Client = MagicMock(name='zwift.Client')
+# Clients only offer what ZwiftService calls on them
+_zwift_stub.Client.return_value = MagicMock(spec=['get_profile'])
+_zwift_stub.__all__ = ['Client']
+sys.modules['zwift'] = _zwift_stub
+
+# Every service module is imported once here, right after the stub, so the
+# imports in the test modules are plain sys.modules lookups
+from services.activity_processor import ActivityProcessor  # noqa: E402
+from services.fit_file_service import FitFileService  # noqa: E402
+from services.garmin_service import GarminService  # noqa: E402
+from services.mywhoosh_service import MyWhooshService  # noqa: E402
+from services.zwift_service import ZwiftService  # noqa: F401,E402
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-network", action="store_true", default=False,
+                     help="run tests marked 'network' against real services")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-network"):
+        return
+    skip_network = pytest.mark.skip(reason="needs --run-network")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip_network)
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """One pooled requests.Session shared by every test that needs a real one."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def mock_mywhoosh():
+    """Stand-in for MyWhooshService; the spec rejects misspelt methods and attributes."""
+    return Mock(spec_set=MyWhooshService)
+
+
+@pytest.fixture
+def mock_fit_file():
+    """Stand-in for FitFileService; the spec rejects misspelt methods and attributes."""
+    return Mock(spec_set=FitFileService)
+
+
+@pytest.fixture
+def mock_garmin():
+    """Stand-in for GarminService; the spec rejects misspelt methods and attributes."""
+    return Mock(spec_set=GarminService)
+
+
+@pytest.fixture
+def processor(mock_mywhoosh, mock_fit_file, mock_garmin):
+    """ActivityProcessor wired to the mock services."""
+    return ActivityProcessor(mock_mywhoosh, mock_fit_file, mock_garmin)
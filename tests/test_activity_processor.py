@@ -1,14 +1,134 @@
 import pytest
-from unittest.mock import MagicMock
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
 from services.activity_processor import ActivityProcessor
 
-def test_activity_processor_init():
-    mock_mywhoosh = MagicMock()
-    mock_fit_file = MagicMock()
-    mock_garmin = MagicMock()
-    
+def test_activity_processor_init(mock_mywhoosh, mock_fit_file, mock_garmin):
     ap = ActivityProcessor(mock_mywhoosh, mock_fit_file, mock_garmin)
     assert isinstance(ap, ActivityProcessor)
-    assert ap.mywhoosh_service == mock_mywhoosh
-    assert ap.fit_file_service == mock_fit_file
-    assert ap.garmin_service == mock_garmin
+    assert ap.mywhoosh_service is mock_mywhoosh
+    assert ap.fit_file_service is mock_fit_file
+    assert ap.garmin_service is mock_garmin
+
+
+def test_process_multiple_activities_uploads_in_order(mock_mywhoosh, mock_fit_file, mock_garmin):
+    activities = [{'id': str(i), 'name': f'Ride {i}'} for i in range(5)]
+    mock_mywhoosh.get_activities.return_value = activities
+    mock_mywhoosh.download_activity_bytes.side_effect = lambda a: a['id'].encode()
+    mock_fit_file.modify_device_info_bytes.side_effect = lambda data: b'mod_' + data
+
+    ap = ActivityProcessor(mock_mywhoosh, mock_fit_file, mock_garmin, max_workers=2)
+    stats = ap.process_multiple_activities(limit=5, check_duplicates=False)
+
+    assert stats == {'total': 5, 'synced': 5, 'skipped': 0, 'errors': 0}
+    uploaded = [c.args for c in mock_garmin.upload_activity_bytes.call_args_list]
+    assert uploaded == [(f"mod_{i}".encode(), f"mywhoosh_{i}.fit") for i in range(5)]
+
+
+def test_process_multiple_activities_skips_duplicates(processor, mock_mywhoosh, mock_garmin):
+    mock_mywhoosh.get_activities.return_value = [
+        {'id': '1', 'name': 'Ride 1', 'date': '2024-01-01T08:00:00Z'},
+        {'id': '2', 'name': 'Ride 2', 'date': '2024-01-02T08:00:00Z'},
+    ]
+    mock_garmin.check_duplicate_activity.side_effect = lambda date, name: name == 'Ride 1'
+
+    stats = processor.process_multiple_activities(limit=2)
+
+    assert stats == {'total': 2, 'synced': 1, 'skipped': 1, 'errors': 0}
+    assert mock_garmin.check_duplicate_activity.call_count == 2
+    mock_mywhoosh.download_activity_bytes.assert_called_once_with({'id': '2', 'name': 'Ride 2', 'date': '2024-01-02T08:00:00Z'})
+
+
+def test_parse_activity_date_formats(processor):
+    expected = datetime(2024, 1, 1, 8, 30)
+
+    assert processor._parse_activity_date('2024-01-01T08:30:00.000Z') == expected
+    assert processor._parse_activity_date('2024-01-01T08:30:00Z') == expected
+    assert processor._parse_activity_date('2024-01-01 08:30:00') == expected
+    assert processor._parse_activity_date('2024-01-01T08:30:00+00:00') == expected
+    assert processor._parse_activity_date('1704097800') == datetime.fromtimestamp(1704097800)
+    assert processor._parse_activity_date('1704097800000') == datetime.fromtimestamp(1704097800)
+    assert processor._parse_activity_date('not a date') is None
+    assert processor._parse_activity_date(None) is None
+
+
+def _fake_ciso8601(date_str):
+    # Stand-in for ciso8601.parse_datetime: aware for Z/offsets, ValueError otherwise
+    return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+
+
+@pytest.mark.parametrize('iso_parser', [None, _fake_ciso8601], ids=['stdlib', 'ciso8601'])
+def test_parse_activity_date_iso_paths(processor, monkeypatch, iso_parser):
+    monkeypatch.setattr('services.activity_processor._parse_iso_datetime', iso_parser)
+    ActivityProcessor._parse_date_cached.cache_clear()
+    expected = datetime(2024, 1, 1, 8, 30)
+
+    try:
+        assert processor._parse_activity_date('2024-01-01T08:30:00Z') == expected
+        assert processor._parse_activity_date('2024-01-01T08:30:00+00:00') == expected
+        assert processor._parse_activity_date('2024-01-01T08:30:00+02:00') == datetime(
+            2024, 1, 1, 8, 30, tzinfo=timezone(timedelta(hours=2))
+        )
+        assert processor._parse_activity_date('not a date') is None
+    finally:
+        ActivityProcessor._parse_date_cached.cache_clear()
+
+
+def test_authenticate_services_logs_in_to_both(processor, mock_mywhoosh, mock_garmin):
+    mock_garmin.is_authenticated.return_value = False
+
+    processor._authenticate_services(include_garmin=True)
+
+    mock_mywhoosh.authenticate.assert_called_once_with()
+    mock_garmin.authenticate.assert_called_once_with()
+
+
+def test_with_retry_retries_transient_errors(processor, monkeypatch):
+    monkeypatch.setattr('services.activity_processor.time.sleep', lambda s: None)
+
+    calls = []
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            try:
+                raise requests.ConnectionError("reset")
+            except requests.ConnectionError as e:
+                raise RuntimeError("Download failed") from e
+        return "ok"
+
+    assert processor._with_retry(flaky) == "ok"
+    assert len(calls) == 3
+
+
+def test_with_retry_does_not_retry_permanent_errors(processor):
+    fn = Mock(side_effect=ValueError("no activityFileId"))
+
+    with pytest.raises(ValueError):
+        processor._with_retry(fn)
+    assert fn.call_count == 1
+
+
+def test_with_retry_leaves_connection_failures_to_adapter(processor):
+    refused = MaxRetryError(None, '/', NewConnectionError(None, 'Connection refused'))
+    fn = Mock(side_effect=requests.ConnectionError(refused))
+
+    with pytest.raises(requests.ConnectionError):
+        processor._with_retry(fn)
+    assert fn.call_count == 1
+
+
+def test_parse_activity_date_numeric_timestamps(processor):
+
+    assert processor._parse_activity_date(1704097800) == datetime.fromtimestamp(1704097800)
+    assert processor._parse_activity_date('1704097800.5') == datetime.fromtimestamp(1704097800.5)
+
+
+def test_activity_metadata_falls_back_per_activity():
+    keys = ActivityProcessor._resolve_metadata_keys({'id': '1', 'name': 'Ride', 'startTime': 't1'})
+    assert keys == ('id', 'name', 'startTime')
+
+    assert ActivityProcessor._activity_metadata({'id': '1', 'name': 'Ride', 'startTime': 't1'}, keys) == ('1', 'Ride', 't1')
+    assert ActivityProcessor._activity_metadata({'_id': '2', 'title': 'Run', 'date': 't2'}, keys) == ('2', 'Run', 't2')
+    assert ActivityProcessor._activity_metadata({}, keys) == ('unknown', 'Unknown Activity', None)
@@ -1,6 +1,42 @@
-import pytest
+import os
+import tempfile
+from fit_tool.fit_file import FitFile
+from fit_tool.fit_file_builder import FitFileBuilder
+from fit_tool.profile.messages.file_id_message import FileIdMessage
+from fit_tool.profile.profile_type import FileType, Manufacturer
 from services.fit_file_service import FitFileService
 
+
+def _build_fit_bytes() -> bytes:
+    file_id = FileIdMessage()
+    file_id.type = FileType.ACTIVITY
+    file_id.manufacturer = Manufacturer.DEVELOPMENT.value
+    file_id.product = 0
+    file_id.serial_number = 12345
+    builder = FitFileBuilder(auto_define=True)
+    builder.add(file_id)
+    return bytes(builder.build().to_bytes())
+
 def test_fit_file_service_init():
     fs = FitFileService()
     assert isinstance(fs, FitFileService)
+
+def test_modify_device_info_bytes_matches_file_path():
+    fs = FitFileService()
+    data = _build_fit_bytes()
+
+    modified = fs.modify_device_info_bytes(data)
+
+    file_id = FitFile.from_bytes(modified).records[1].message
+    assert file_id.manufacturer == Manufacturer.GARMIN.value
+    assert file_id.product == 4024
+
+    with tempfile.NamedTemporaryFile(suffix='.fit', delete=False) as f:
+        f.write(data)
+    try:
+        modified_path = fs.modify_device_info(f.name)
+        with open(modified_path, 'rb') as mf:
+            assert mf.read() == modified
+        fs.cleanup_file(modified_path)
+    finally:
+        os.remove(f.name)
@@ -1,7 +1,155 @@
 import pytest
-from services.garmin_service import GarminService
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from garminconnect import GarminConnectTooManyRequestsError
+import time
+from services.garmin_service import GarminService, _TokenBucket
 
-def test_garmin_service_init():
+
+def test_check_duplicate_uses_prefetched_activities():
+    svc = GarminService(username='user', password='pass')
+    svc.client = MagicMock()
+    svc._authenticated = True
+    svc.client.connectapi.return_value = [
+        {'activityName': 'Morning Ride', 'startTimeLocal': '2024-01-02 08:05:00'},
+    ]
+
+    svc.prefetch_activities(datetime(2024, 1, 1), datetime(2024, 1, 3))
+
+    assert svc.check_duplicate_activity(datetime(2024, 1, 2, 8, 0), 'Morning Ride')
+    assert not svc.check_duplicate_activity(datetime(2024, 1, 1, 8, 0), 'Morning Ride')
+    svc.client.connectapi.assert_called_once_with(
+        svc.client.garmin_connect_activities,
+        params={'startDate': '2024-01-01', 'endDate': '2024-01-03', 'start': '0', 'limit': '20'},
+    )
+    assert svc.has_activities_on(datetime(2024, 1, 2))
+    assert not svc.has_activities_on(datetime(2024, 1, 1))
+    assert svc.has_activities_on(datetime(2024, 2, 1))
+
+
+def test_prefetch_skips_long_ranges():
+    svc = GarminService(username='user', password='pass')
+    svc.client = MagicMock()
+    svc._authenticated = True
+
+    assert svc.prefetch_activities(datetime(2023, 1, 1), datetime(2024, 1, 1)) == 0
+
+    svc.client.connectapi.assert_not_called()
+    assert svc.has_activities_on(datetime(2023, 6, 1))
+
+
+def test_search_activities_pages_until_short_page():
+    svc = GarminService(username='user', password='pass')
+    svc.client = MagicMock()
+    svc._authenticated = True
+    full_page = [{'activityName': 'Ride', 'startTimeLocal': '2024-01-02 08:00:00'}] * 20
+    svc.client.connectapi.side_effect = [full_page, full_page[:5]]
+
+    assert svc.prefetch_activities(datetime(2024, 1, 1), datetime(2024, 1, 3)) == 25
+
+    starts = [c.kwargs['params']['start'] for c in svc.client.connectapi.call_args_list]
+    assert starts == ['0', '20']
+
+
+def test_token_bucket_spaces_requests():
+    bucket = _TokenBucket(rate=50.0)
+    start = time.monotonic()
+    for _ in range(60):
+        bucket.acquire()
+    # 50 tokens of burst, then 10 more at 50/s
+    assert time.monotonic() - start >= 0.15
+
+
+def test_authenticate_backs_off_on_rate_limit(monkeypatch):
+    monkeypatch.setattr('services.garmin_service.time.sleep', lambda s: None)
+    svc = GarminService(username='user', password='pass')
+    svc.client = MagicMock()
+    svc.client.login.side_effect = [GarminConnectTooManyRequestsError("429"), None]
+
+    svc.authenticate()
+
+    assert svc.is_authenticated()
+    assert svc.client.login.call_count == 2
+
+
+def test_check_duplicate_caches_per_day_until_invalidated():
     svc = GarminService(username='user', password='pass')
-    assert svc.username == 'user'
-    assert svc.password == 'pass'
+    svc.client = MagicMock()
+    svc._authenticated = True
+    svc.client.connectapi.return_value = []
+
+    svc.check_duplicate_activity(datetime(2024, 1, 2, 8, 0), 'Ride A')
+    svc.check_duplicate_activity(datetime(2024, 1, 2, 18, 0), 'Ride B')
+    assert svc.client.connectapi.call_count == 1
+
+    svc.invalidate_date_cache(datetime(2024, 1, 2))
+    svc.check_duplicate_activity(datetime(2024, 1, 2, 8, 0), 'Ride A')
+    assert svc.client.connectapi.call_count == 2
+
+
+def test_check_duplicate_matches_window_and_name():
+    svc = GarminService(username='user', password='pass')
+    svc.client = MagicMock()
+    svc._authenticated = True
+    svc.client.connectapi.return_value = [
+        {'activityName': 'Evening Ride', 'startTimeLocal': '2024-01-02T19:00:00'},
+        {'activityName': 'Other Ride', 'startTimeLocal': '2024-01-02T08:30:00'},
+        {'activityName': 'MyWhoosh Morning Ride', 'startTimeLocal': '2024-01-02T09:00:00'},
+    ]
+
+    assert svc.check_duplicate_activity(datetime(2024, 1, 2, 8, 0), 'Morning Ride')
+    assert svc.check_duplicate_activity(datetime(2024, 1, 2, 18, 0))
+    assert not svc.check_duplicate_activity(datetime(2024, 1, 2, 13, 0), 'Morning Ride')
+    assert not svc.check_duplicate_activity(datetime(2024, 1, 2, 8, 0), 'Climb')
+
+
+def test_check_duplicate_parses_utc_z_suffix():
+    svc = GarminService(username='user', password='pass')
+    svc.client = MagicMock()
+    svc._authenticated = True
+    svc.client.connectapi.return_value = [
+        {'activityName': 'Ride', 'startTime': '2024-01-02T09:00:00Z'},
+    ]
+
+    assert svc.check_duplicate_activity(datetime(2024, 1, 2, 9, 30, tzinfo=timezone.utc))
+
+
+def test_authenticate_reuses_cached_tokens(tmp_path):
+    svc = GarminService(username='user', password='pass', token_dir=str(tmp_path))
+    svc.client = MagicMock()
+
+    svc.authenticate()
+
+    svc.client.login.assert_called_once_with(str(tmp_path))
+    svc.client.garth.dump.assert_called_once_with(str(tmp_path))
+    assert svc.is_authenticated()
+
+
+def test_authenticate_falls_back_to_fresh_login(tmp_path):
+    svc = GarminService(username='user', password='pass', token_dir=str(tmp_path))
+    svc.client = MagicMock()
+    svc.client.login.side_effect = [FileNotFoundError('oauth1_token.json'), None]
+
+    svc.authenticate()
+
+    assert svc.client.login.call_args_list[1].args == ()
+    svc.client.garth.dump.assert_called_once_with(str(tmp_path))
+
+
+def test_authenticate_does_not_fall_back_to_sso_when_rate_limited(tmp_path):
+    svc = GarminService(username='user', password='pass', token_dir=str(tmp_path))
+    svc.client = MagicMock()
+    svc.client.login.side_effect = GarminConnectTooManyRequestsError("429")
+
+    with pytest.raises(GarminConnectTooManyRequestsError):
+        svc.authenticate()
+    svc.client.login.assert_called_once_with(str(tmp_path))
+
+
+@pytest.mark.parametrize('rate', [0, -1.0])
+def test_token_bucket_rejects_non_positive_rate(rate):
+    bucket = _TokenBucket(2.0)
+    with pytest.raises(ValueError):
+        bucket.set_rate(rate)
+    with pytest.raises(ValueError):
+        _TokenBucket(rate)
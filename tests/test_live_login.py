@@ -0,0 +1,40 @@
+import os
+import json
+import uuid
+import secrets
+import http.client
+import pytest
+
+# Opt-in smoke test against the real MyWhoosh login endpoint. Uses the
+# stdlib client so it doesn't depend on the requests stack being mocked.
+EMAIL = os.getenv('MYWHOOSH_EMAIL')
+PASSWORD = os.getenv('MYWHOOSH_PASSWORD')
+
+# Serialized once at import; the body is the same for every run of the test
+_BODY = json.dumps({
+    "Username": EMAIL,
+    "Password": PASSWORD,
+    "Platform": "Android",
+    "Action": 1001,
+    "CorrelationId": secrets.token_hex(16),
+    "DeviceId": str(uuid.uuid4()),
+    "Authorization": "",
+}).encode('utf-8')
+
+
+@pytest.mark.network
+@pytest.mark.skipif(not (EMAIL and PASSWORD), reason="MYWHOOSH_EMAIL/MYWHOOSH_PASSWORD not set")
+def test_live_mywhoosh_login():
+    conn = http.client.HTTPSConnection("services.mywhoosh.com", timeout=30)
+    try:
+        conn.request("POST", "/http-service/api/login", body=_BODY,
+                     headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        raw = response.read()
+    finally:
+        conn.close()
+
+    assert response.status == 200, f"HTTP {response.status}: {raw[:500]!r}"
+    body = json.loads(raw)
+    assert body.get("Success"), body.get("Message")
+    assert body.get("AccessToken")
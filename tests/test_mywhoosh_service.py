@@ -1,7 +1,235 @@
+import os
+import json
 import pytest
-from services.mywhoosh_service import MyWhooshService
+import requests
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from services.mywhoosh_service import MyWhooshService, _decode_json, _encode_json
+
+
+def test_session_cache_round_trip(tmp_path):
+    session_file = str(tmp_path / 'session.json')
+    svc = MyWhooshService(email='test@example.com', password='secret', session_file=session_file)
+    svc.access_token = 'token'
+    svc.whoosh_id = 'whoosh'
+    svc.save_session()
+
+    restored = MyWhooshService(email='test@example.com', password='secret', session_file=session_file)
+    assert restored.load_session()
+    assert restored.access_token == 'token'
+    assert restored.whoosh_id == 'whoosh'
+
+    restored.invalidate_session()
+    assert restored.access_token is None
+    assert not MyWhooshService(email='test@example.com', password='secret',
+                               session_file=session_file).load_session()
+
+
+def test_injected_session_is_reused(http_session):
+    with MyWhooshService(email='test@example.com', password='secret', session=http_session) as svc:
+        assert svc.session is http_session
+        assert not svc._owns_session
+
+
+def test_close_only_closes_owned_session():
+    shared = MagicMock()
+    with MyWhooshService(email='test@example.com', password='secret', session=shared):
+        pass
+    shared.close.assert_not_called()
 
-def test_mywhoosh_service_init():
     svc = MyWhooshService(email='test@example.com', password='secret')
-    assert svc.email == 'test@example.com'
-    assert svc.password == 'secret'
+    svc.session = MagicMock()
+    with svc:
+        pass
+    svc.session.close.assert_called_once_with()
+
+
+def _authenticated_service(s3_body: bytes) -> MyWhooshService:
+    session = MagicMock()
+    url_response = MagicMock(status_code=200, content=b'{"data": "https://s3.example.com/ride.fit"}')
+    url_response.json.return_value = {'data': 'https://s3.example.com/ride.fit'}
+    session.post.return_value = url_response
+
+    s3_response = MagicMock(status_code=200, headers={'Content-Type': 'application/octet-stream'})
+    s3_response.__enter__.return_value = s3_response
+    s3_response.iter_content.return_value = [s3_body[:10], s3_body[10:]]
+    session.get.return_value = s3_response
+
+    svc = MyWhooshService(email='test@example.com', password='secret', session=session)
+    svc.access_token = 'token'
+    svc.whoosh_id = 'whoosh'
+    return svc
+
+
+def test_download_activity_streams_to_file():
+    body = b'\x0e\x10\x00\x00\x00\x00\x00\x00.FIT\x00\x00' + b'x' * 100
+    svc = _authenticated_service(body)
+
+    file_path = svc.download_activity({'id': 'a1', 'activityFileId': 'f1'})
+    try:
+        with open(file_path, 'rb') as f:
+            assert f.read() == body
+        assert file_path.endswith('.fit')
+    finally:
+        os.remove(file_path)
+
+
+def test_get_activities_sends_single_request():
+    svc = _authenticated_service(b'')
+    response = MagicMock(status_code=200, content=b'{"data": {"results": [{"id": "1"}, {"id": "2"}]}}')
+    response.json.return_value = {'data': {'results': [{'id': '1'}, {'id': '2'}]}}
+    svc.session.post.return_value = response
+
+    assert svc.get_activities(limit=1) == [{'id': '1'}]
+    assert svc.session.post.call_count == 1
+
+
+# Stand-in for orjson: loads() takes bytes, dumps() returns compact bytes
+_FAKE_ORJSON = SimpleNamespace(
+    loads=json.loads,
+    dumps=lambda obj: json.dumps(obj, separators=(',', ':')).encode('utf-8'),
+)
+
+
+@pytest.mark.parametrize('json_backend', [None, _FAKE_ORJSON], ids=['stdlib', 'orjson'])
+def test_json_helpers_on_both_backends(monkeypatch, json_backend):
+    monkeypatch.setattr('services.mywhoosh_service.orjson', json_backend)
+    response = requests.Response()
+    response._content = b'{"data": {"results": [{"id": "1"}]}}'
+
+    assert _encode_json({'pageSize': 10, 'sortDir': 'DESC'}) == b'{"pageSize":10,"sortDir":"DESC"}'
+    assert _decode_json(response) == {'data': {'results': [{'id': '1'}]}}
+
+    response._content = b'<html>'
+    with pytest.raises(ValueError):
+        _decode_json(response)
+
+
+def test_get_activities_does_not_retry_server_errors():
+    svc = _authenticated_service(b'')
+    svc.session.post.return_value = MagicMock(status_code=500, content=b'oops', text='oops')
+
+    with pytest.raises(RuntimeError):
+        svc.get_activities()
+    assert svc.session.post.call_count == 1
+
+
+def test_download_activities_keeps_input_order():
+    body = b'\x0e\x10\x00\x00\x00\x00\x00\x00.FIT' + b'\x00' * 16
+    svc = _authenticated_service(body)
+
+    paths = svc.download_activities([{'id': 'a1', 'activityFileId': 'f1'},
+                                     {'id': 'a2', 'activityFileId': 'f2'}])
+    try:
+        assert 'mywhoosh_a1_' in paths[0]
+        assert 'mywhoosh_a2_' in paths[1]
+    finally:
+        for path in paths:
+            os.remove(path)
+
+
+def test_download_failure_leaves_no_partial_file(tmp_path, monkeypatch):
+    monkeypatch.setattr('tempfile.gettempdir', lambda: str(tmp_path))
+    svc = _authenticated_service(b'')
+    svc.session.get.return_value.iter_content.side_effect = OSError('connection reset')
+
+    with pytest.raises(RuntimeError):
+        svc.download_activity({'id': 'a1', 'activityFileId': 'f1'})
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_get_activities_reports_malformed_json():
+    svc = _authenticated_service(b'')
+    response = MagicMock(status_code=200, content=b'<html>', text='<html>')
+    response.json.side_effect = ValueError('Expecting value')
+    svc.session.post.return_value = response
+
+    with pytest.raises(RuntimeError, match='Could not fetch activities'):
+        svc.get_activities()
+
+
+def test_download_rejects_html_error_page_before_reading_body(tmp_path, monkeypatch):
+    monkeypatch.setattr('tempfile.gettempdir', lambda: str(tmp_path))
+    svc = _authenticated_service(b'<html>expired</html>')
+    svc.session.get.return_value.headers = {'Content-Type': 'text/html; charset=utf-8'}
+
+    with pytest.raises(RuntimeError, match='text/html'):
+        svc.download_activity({'id': 'a1', 'activityFileId': 'f1'})
+    svc.session.get.return_value.iter_content.assert_not_called()
+    assert list(tmp_path.iterdir()) == []
+
+
+def _login_response(body: dict) -> MagicMock:
+    response = MagicMock(status_code=200)
+    response.json.return_value = body
+    response.content = json.dumps(body).encode()
+    return response
+
+
+def test_authenticate_success_stores_tokens():
+    session = MagicMock()
+    session.post.return_value = _login_response(
+        {'Success': True, 'WhooshId': 'whoosh', 'AccessToken': 'A' * 60}
+    )
+    svc = MyWhooshService(email='test@example.com', password='secret', session=session)
+
+    svc.authenticate()
+
+    assert svc.access_token == 'A' * 60
+    assert svc.whoosh_id == 'whoosh'
+    assert session.post.call_args.kwargs['json']['Username'] == 'test@example.com'
+
+
+@pytest.mark.parametrize('post_result', [
+    _login_response({'Success': False, 'Message': 'Invalid credentials'}),
+    requests.ConnectionError('unreachable'),
+    requests.Timeout('read timed out'),
+])
+def test_authenticate_failure_raises_runtime_error(post_result):
+    session = MagicMock()
+    if isinstance(post_result, Exception):
+        session.post.side_effect = post_result
+    else:
+        session.post.return_value = post_result
+    svc = MyWhooshService(email='test@example.com', password='secret', session=session)
+
+    with pytest.raises(RuntimeError):
+        svc.authenticate()
+    assert svc.access_token is None
+
+
+def test_api_calls_send_client_user_agent_on_injected_session(http_session, monkeypatch):
+    svc = MyWhooshService(email='test@example.com', password='secret', session=http_session)
+    svc.access_token = 'token'
+    response = MagicMock(status_code=200, content=b'{"data": {"results": []}}')
+    response.json.return_value = {'data': {'results': []}}
+    post = MagicMock(return_value=response)
+    monkeypatch.setattr(http_session, 'post', post)
+
+    svc.get_activities()
+
+    assert http_session.headers['User-Agent'].startswith('python-requests')
+    assert post.call_args.kwargs['headers']['User-Agent'] == 'MyWhoosh-Python-Client/1.0'
+
+
+def test_download_activities_removes_files_when_one_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr('tempfile.gettempdir', lambda: str(tmp_path))
+    body = b'\x0e\x10\x00\x00\x00\x00\x00\x00.FIT' + b'\x00' * 16
+    svc = _authenticated_service(body)
+
+    with pytest.raises(ValueError):
+        svc.download_activities([{'id': 'a1', 'activityFileId': 'f1'},
+                                 {'id': 'a2'}])  # no activityFileId
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_reauthenticate_skips_login_if_token_already_replaced():
+    svc = MyWhooshService(email='test@example.com', password='secret', session=MagicMock())
+    svc.authenticate = MagicMock()
+    svc.access_token = 'fresh'
+
+    svc._reauthenticate('stale')
+    svc.authenticate.assert_not_called()
+
+    svc._reauthenticate('fresh')
+    svc.authenticate.assert_called_once_with()
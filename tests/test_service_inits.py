@@ -0,0 +1,32 @@
+import pytest
+from services.garmin_service import GarminService
+from services.mywhoosh_service import MyWhooshService
+from services.zwift_service import ZwiftService
+
+
+# Built once per session; the tests below only read attributes
+@pytest.fixture(scope="session")
+def garmin_svc():
+    return GarminService(username='user', password='pass')
+
+
+@pytest.fixture(scope="session")
+def zwift_svc():
+    return ZwiftService(username='user', password='pass')
+
+
+@pytest.fixture(scope="session")
+def mywhoosh_svc():
+    with MyWhooshService(email='test@example.com', password='secret') as svc:
+        yield svc
+
+
+@pytest.mark.parametrize("fixture_name,attrs", [
+    ('garmin_svc', {'username': 'user', 'password': 'pass'}),
+    ('zwift_svc', {'username': 'user', 'password': 'pass'}),
+    ('mywhoosh_svc', {'email': 'test@example.com', 'password': 'secret'}),
+])
+def test_service_init_stores_credentials(request, fixture_name, attrs):
+    svc = request.getfixturevalue(fixture_name)
+    for name, value in attrs.items():
+        assert getattr(svc, name) == value
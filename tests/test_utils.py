@@ -0,0 +1,19 @@
+import logging
+from services.utils import first_key, remove_partial
+
+
+def test_first_key_skips_missing_and_none():
+    activity = {'id': None, '_id': 'abc', 'name': 'Ride'}
+    assert first_key(activity, ('id', '_id'), 'unknown') == 'abc'
+    assert first_key(activity, ('title',), 'Unknown Activity') == 'Unknown Activity'
+    assert first_key(activity, ('missing',)) is None
+
+
+def test_remove_partial_ignores_missing_file(tmp_path):
+    part = tmp_path / 'ride.fit.part'
+    part.write_bytes(b'partial')
+
+    remove_partial(str(part), logging.getLogger(__name__))
+    remove_partial(str(part), logging.getLogger(__name__))
+
+    assert not part.exists()
@@ -1,7 +1,36 @@
 import pytest
+from unittest.mock import MagicMock
 from services.zwift_service import ZwiftService
 
-def test_zwift_service_init():
-    svc = ZwiftService(username='user', password='pass')
-    assert svc.username == 'user'
-    assert svc.password == 'pass'
+
+def _service_with_download(chunks) -> ZwiftService:
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.iter_content.side_effect = chunks
+    svc = ZwiftService(username='user', password='pass', session=MagicMock())
+    svc.session.get.return_value = response
+    svc.client = MagicMock()
+    svc.client.get_profile.return_value.get_activities.return_value = [
+        {'id': 42, 'fitFileBucket': 'bucket', 'fitFileKey': 'key'}
+    ]
+    return svc
+
+
+def test_download_moves_complete_file_into_place(tmp_path, monkeypatch):
+    monkeypatch.setattr('tempfile.gettempdir', lambda: str(tmp_path))
+    svc = _service_with_download(lambda chunk_size: iter([b'abc', b'def']))
+
+    path = svc.download_last_activity()
+
+    with open(path, 'rb') as f:
+        assert f.read() == b'abcdef'
+    assert [p.name for p in tmp_path.iterdir()] == ['zwift_activity_42.fit']
+
+
+def test_download_failure_leaves_no_partial_file(tmp_path, monkeypatch):
+    monkeypatch.setattr('tempfile.gettempdir', lambda: str(tmp_path))
+    svc = _service_with_download(OSError('connection reset'))
+
+    with pytest.raises(RuntimeError):
+        svc.download_last_activity()
+    assert list(tmp_path.iterdir()) == []